@@ -3,10 +3,10 @@ Whisper GUI Application - Main entry point
 """
 
 import sys
-import traceback
 from PyQt6.QtWidgets import QApplication, QMessageBox
 
 from whisper_gui.ui.main_window import WhisperGUI
+from whisper_gui.ui.styles import STATE_STYLE_SHEET
 
 def main():
     """
@@ -17,6 +17,7 @@ def main():
         
         # 어플리케이션 스타일 설정
         app.setStyle("Fusion")  # 모던 스타일 적용
+        app.setStyleSheet(STATE_STYLE_SHEET)  # 상태 레이블 색상 (레이블은 속성만 바꿈)
         
         # 메인 윈도우 생성 및 표시
         window = WhisperGUI()
@@ -25,6 +26,7 @@ def main():
         sys.exit(app.exec())
     except Exception as e:
         print(f"프로그램 실행 중 오류 발생: {str(e)}")
+        import traceback  # 오류 경로에서만 사용
         traceback.print_exc()
         
         # 메시지 박스로 오류 표시
@@ -1,8 +1,33 @@
 # whisper_gui/core/__init__.py
 """Core modules for Whisper functionality."""
 
-from .whisper_dll import WhisperDLL
-from .recording_thread import RecordingThread
-from .transcription_thread import TranscriptionThread
-from .utils import find_dll_file, check_required_dlls
-from .model_downloader import ModelDownloader 
\ No newline at end of file
+import importlib
+
+__all__ = ["WhisperDLL", "RecordingThread", "TranscriptionRunnable", "ModelCheckRunnable",
+           "find_dll_file", "check_required_dlls", "list_dir_cached",
+           "list_file_sizes_cached", "ModelDownloader"]
+
+# 이름별 정의 모듈 (처음 접근할 때 가져와 pyaudio, soundfile, numba 등의 로드를 필요할 때로 늦춤)
+_LAZY_IMPORTS = {
+    "WhisperDLL": ".whisper_dll",
+    "RecordingThread": ".recording_thread",
+    "TranscriptionRunnable": ".transcription_thread",
+    "ModelCheckRunnable": ".model_check_thread",
+    "find_dll_file": ".utils",
+    "check_required_dlls": ".utils",
+    "list_dir_cached": ".utils",
+    "list_file_sizes_cached": ".utils",
+    "ModelDownloader": ".model_downloader",
+}
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # 이후 접근은 일반 속성 조회로 처리
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,142 @@
+"""
+오디오 변환 커널 - int16 PCM을 float32 모노로 변환하고 리샘플링하는 고속 루틴
+
+numba가 설치되어 있으면 다운믹스와 정규화를 한 번의 병렬 패스로 처리하고,
+없으면 동일한 결과를 내는 NumPy 구현을 사용합니다.
+전처리(float32 변환 + 정규화)도 같은 방식으로 가속하며,
+리샘플링은 scipy가 있으면 폴리페이즈 FIR 필터를, 없으면 선형 보간을 사용합니다.
+"""
+
+import functools
+import importlib.util
+from math import gcd
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# scipy.signal은 로드에 1초 가까이 걸리므로 설치 여부만 확인하고, 실제 임포트는 처음 리샘플링할 때 수행
+# (numba는 병렬 스레드 풀을 메인 스레드에서 초기화해야 하므로 임포트 시점에 로드)
+SCIPY_AVAILABLE = importlib.util.find_spec("scipy") is not None
+
+# int16 PCM 정규화 계수
+PCM16_SCALE = 1.0 / 32768.0
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _pcm16_to_f32_mono_jit(src, channels, out):
+        scale = np.float32(PCM16_SCALE / channels)
+        for i in prange(out.shape[0]):
+            base = i * channels
+            acc = np.int32(0)
+            for c in range(channels):
+                acc += src[base + c]
+            out[i] = acc * scale
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _to_float32_peak_jit(src, dst):
+        peak = np.float32(0.0)
+        for i in prange(dst.shape[0]):
+            v = np.float32(src[i])
+            dst[i] = v
+            peak = max(peak, abs(v))
+        return peak
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _scale_jit(dst, scale):
+        for i in prange(dst.shape[0]):
+            dst[i] *= scale
+
+def pcm16_to_f32_mono(src, channels, out):
+    """
+    int16 PCM을 모노 float32(-1.0 ~ 1.0)로 변환하여 out에 기록합니다.
+
+    Args:
+        src (np.ndarray): 인터리브된 int16 PCM 샘플
+        channels (int): 채널 수
+        out (np.ndarray): 결과를 기록할 float32 배열 (길이 = 프레임 수)
+
+    Returns:
+        np.ndarray: out
+    """
+    n_frames = out.shape[0]
+    if NUMBA_AVAILABLE:
+        _pcm16_to_f32_mono_jit(src, channels, out)
+        return out
+
+    pcm = src[:n_frames * channels]
+    if channels > 1:
+        # int32로 채널 합을 구한 뒤 JIT 커널과 같이 (합 * 정규화 계수 / 채널 수)로 정확한 평균을 계산
+        pcm = pcm.reshape(-1, channels).sum(axis=1, dtype=np.int32)
+    np.multiply(pcm, np.float32(PCM16_SCALE / channels), out=out)
+    return out
+
+@functools.lru_cache(maxsize=16)
+def _resample_filter(up, down):
+    """(up, down) 비율에 맞는 저역통과 FIR 계수를 한 번만 설계하여 재사용합니다."""
+    # resample_poly의 기본 설계와 동일 (Kaiser 창, 차단 주파수 1/max(up, down))
+    from scipy.signal import firwin
+    
+    max_rate = max(up, down)
+    h = firwin(2 * 10 * max_rate + 1, 1.0 / max_rate, window=('kaiser', 5.0))
+    h = h.astype(np.float32)
+    h.flags.writeable = False  # 캐시된 계수가 변경되지 않도록 보호
+    return h
+
+def resample(audio, src_rate, dst_rate):
+    """
+    float32 오디오를 src_rate에서 dst_rate로 리샘플링합니다.
+
+    Args:
+        audio (np.ndarray): 모노 float32 오디오
+        src_rate (int): 원본 샘플링 레이트
+        dst_rate (int): 목표 샘플링 레이트
+
+    Returns:
+        np.ndarray: 리샘플링된 float32 오디오
+    """
+    if src_rate == dst_rate:
+        return audio
+
+    g = gcd(src_rate, dst_rate)
+    up, down = dst_rate // g, src_rate // g
+    if SCIPY_AVAILABLE:
+        from scipy.signal import resample_poly
+        out = resample_poly(audio, up, down, window=_resample_filter(up, down))
+        return out.astype(np.float32, copy=False)
+
+    n_out = (len(audio) * up + down - 1) // down
+    positions = np.arange(n_out, dtype=np.float64) * (src_rate / dst_rate)
+    return np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+
+def to_float32_normalize(src, dst):
+    """
+    임의 dtype의 모노 오디오를 float32로 변환하면서 최대 진폭이 1.0이 되도록 정규화하여 dst에 기록합니다.
+    변환과 최대값 탐색을 한 번의 패스로 처리하고, 배율 적용은 dst 위에서 제자리로 수행합니다.
+
+    Args:
+        src (np.ndarray): 1차원 오디오 샘플
+        dst (np.ndarray): 결과를 기록할 연속된 float32 배열 (길이 = len(src))
+
+    Returns:
+        np.ndarray: dst
+    """
+    if NUMBA_AVAILABLE:
+        peak = _to_float32_peak_jit(src, dst)
+        if peak > 0.0:
+            _scale_jit(dst, np.float32(1.0 / peak))
+        return dst
+
+    np.copyto(dst, src, casting='unsafe')
+    peak = np.max(np.abs(dst)) if dst.size else 0.0
+    if peak > 0.0:
+        np.multiply(dst, np.float32(1.0 / peak), out=dst)
+    return dst
+
+# 첫 호출 시의 JIT 컴파일 지연을 없애기 위해 임포트 시점에 미리 컴파일
+if NUMBA_AVAILABLE:
+    pcm16_to_f32_mono(np.zeros(2, dtype=np.int16), 2, np.empty(1, dtype=np.float32))
+    to_float32_normalize(np.zeros(1, dtype=np.float32), np.empty(1, dtype=np.float32))
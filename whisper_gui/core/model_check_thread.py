@@ -0,0 +1,72 @@
+"""
+ModelCheckRunnable class - Scans the models directory and reads model file headers on a thread pool worker.
+"""
+
+import os
+import re
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from .utils import list_file_sizes_cached
+from .whisper_dll import read_model_ftype
+
+# 모델 파일 이름 (ggml-small.en-q5_1.bin -> 이름 small, 영어 전용, 접미사 -q5_1)
+_MODEL_RE = re.compile(r'^(?:ggml-)?(.+?)(\.en)?(-[^.]*)?\.(?:bin|ggml)$')
+
+def parse_model_file_name(file_name):
+    """
+    모델 파일 이름에서 모델 이름과 영어 전용 여부를 추출합니다.
+    Whisper 모델 파일(.bin, .ggml)이 아니면 None을 반환합니다.
+    """
+    m = _MODEL_RE.match(file_name)
+    if m is None:
+        return None
+    return m.group(1) + (m.group(3) or ""), m.group(2) is not None
+
+class ModelCheckSignals(QObject):
+    """모델 파일 검사 결과를 전달하는 신호 (QRunnable은 신호를 가질 수 없음)"""
+    listed = pyqtSignal(bool, list)  # (모델 디렉터리 존재 여부, [(모델 파일 경로, 모델 이름, 영어 전용 여부, 크기 바이트), ...])
+    checked = pyqtSignal(str, str)  # (모델 파일 경로, 가중치 형식 - ggml 모델이 아니면 빈 문자열)
+    finished = pyqtSignal()
+    error = pyqtSignal(str)
+
+class ModelCheckRunnable(QRunnable):
+    """
+    모델 파일 검사 작업 (모델 디렉터리를 읽은 뒤 모델 파일마다 헤더를 읽어 가중치 형식을 확인)
+    
+    모델이 많거나 네트워크 드라이브에 있으면 디렉터리를 읽고 파일을 여는 데 시간이 걸리므로,
+    UI 스레드를 막지 않도록 작업 스레드에서 실행하고 결과는 신호로 전달합니다.
+    cancel()을 호출하면 남은 파일은 검사하지 않고 더 이상 신호를 보내지 않습니다.
+    """
+    
+    def __init__(self, models_dir):
+        super().__init__()
+        self.signals = ModelCheckSignals()
+        self.models_dir = models_dir
+        self.cancelled = False  # 취소 요청 여부 (cancel)
+    
+    def cancel(self):
+        """작업 취소 요청 (UI 스레드에서 호출)"""
+        self.cancelled = True
+    
+    def run(self):
+        """모델 디렉터리 읽기 및 모델 파일 검사 실행"""
+        try:
+            exists = os.path.isdir(self.models_dir)
+            models = []
+            for file_name, size in list_file_sizes_cached(self.models_dir):
+                parsed = parse_model_file_name(file_name)
+                if parsed is not None:
+                    models.append((os.path.join(self.models_dir, file_name), *parsed, size))
+            if self.cancelled:
+                return
+            self.signals.listed.emit(exists, models)
+            
+            for model_path, *_ in models:
+                if self.cancelled:
+                    return
+                self.signals.checked.emit(model_path, read_model_ftype(model_path) or "")
+            self.signals.finished.emit()
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.error.emit(str(e))
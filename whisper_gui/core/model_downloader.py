@@ -3,14 +3,20 @@
 """
 
 import os
+import re
 import sys
+import hashlib
 import subprocess
-import threading
-import requests
+import time
+from functools import partial
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                               QComboBox, QPushButton, QProgressBar, 
                               QMessageBox, QFileDialog)
-from PyQt6.QtCore import Qt, pyqtSignal, QObject
+from PyQt6.QtCore import (Qt, QCoreApplication, QUrl, QFile, QIODevice, QTimer,
+                          QObject, QRunnable, QThreadPool, pyqtSignal)
+from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+
+from .utils import invalidate_cache
 
 # 다운로드 가능한 모델 목록
 AVAILABLE_MODELS = [
@@ -26,13 +32,100 @@ AVAILABLE_MODELS = [
     ("large-v2", "다국어 - large v2 (약 2.9GB)"),
     ("large-v3", "다국어 - large v3 (약 2.9GB)"),
     ("large-v3-turbo", "다국어 - large v3 Turbo (약 1.5GB)"),
+    # 양자화 모델 (가중치가 작아 메모리 대역폭이 병목인 CPU/GPU 추론이 빨라지고, 정확도 손실은 작음)
+    ("base-q5_1", "다국어 - base Q5_1 양자화 (약 57MB, 권장)"),
+    ("small-q5_1", "다국어 - small Q5_1 양자화 (약 181MB, 권장)"),
+    ("medium-q5_0", "다국어 - medium Q5_0 양자화 (약 514MB, 권장)"),
+    ("large-v3-turbo-q5_0", "다국어 - large v3 Turbo Q5_0 양자화 (약 547MB, 권장)"),
 ]
 
-# 모델 다운로드 관련 신호를 전달하기 위한 클래스
-class DownloadSignals(QObject):
-    progress = pyqtSignal(int)
-    finished = pyqtSignal(bool, str)
-    status = pyqtSignal(str)
+# 콤보박스 표시 문자열과 모델 코드 (모듈 로드 시 한 번만 생성)
+_MODEL_DISPLAY = [model_desc for _, model_desc in AVAILABLE_MODELS]
+_MODEL_CODES = [model_code for model_code, _ in AVAILABLE_MODELS]
+
+# 수신 데이터를 모아서 파일에 기록하는 단위 (4MB)
+WRITE_CHUNK_SIZE = 4 * 1024 * 1024
+
+# 범위(Range) 요청 병렬 다운로드 설정
+# (Qt는 HTTP/1.1에서 호스트당 최대 6개의 연결을 동시에 사용)
+PARALLEL_CONNECTIONS = 6
+PARALLEL_MIN_SIZE = 64 * 1024 * 1024  # 이보다 작은 파일은 단일 연결로 다운로드
+
+# Hugging Face는 LFS 파일의 SHA-256을 리다이렉트 응답의 X-Linked-Etag 헤더로 알려줌
+_SHA256_RE = re.compile(r'^[0-9a-f]{64}$')
+
+# 모델 저장소 호스트 (다이얼로그를 열 때 미리 연결)
+MODEL_HOST = "huggingface.co"
+
+_network_manager = None
+
+def shared_network_manager():
+    """
+    모든 다운로드 다이얼로그가 공유하는 QNetworkAccessManager를 반환합니다.
+    연결 캐시가 관리자 단위이므로, 공유하면 여러 모델을 받을 때 TCP/TLS 연결을 재사용합니다.
+    (Qt6는 HTTPS에서 HTTP/2를 기본으로 협상하여 요청을 한 연결에 다중화)
+    """
+    global _network_manager
+    if _network_manager is None:
+        _network_manager = QNetworkAccessManager(QCoreApplication.instance())
+    return _network_manager
+
+# 파일 해시 계산 시 한 번에 읽는 크기 (1MB)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+class FileHashSignals(QObject):
+    """파일 해시 계산 결과를 전달하는 신호 (QRunnable은 신호를 가질 수 없음)"""
+    finished = pyqtSignal(str, str)  # (SHA-256 16진수 문자열, 오류 메시지 - 성공 시 빈 문자열)
+
+class FileHashRunnable(QRunnable):
+    """
+    파일 전체의 SHA-256 계산 작업
+    
+    수 GB 모델 파일의 해시는 수 초가 걸리므로 UI 스레드를 막지 않도록 작업 스레드에서 계산합니다.
+    cancel()을 호출하면 읽기를 멈추고 오류와 함께 finished를 보냅니다.
+    """
+    
+    def __init__(self, file_path):
+        super().__init__()
+        self.signals = FileHashSignals()
+        self.file_path = file_path
+        self.cancelled = False  # 취소 요청 여부 (cancel)
+    
+    def cancel(self):
+        """작업 취소 요청 (UI 스레드에서 호출)"""
+        self.cancelled = True
+    
+    def run(self):
+        """해시 계산 실행"""
+        try:
+            hasher = hashlib.sha256()
+            buf = bytearray(HASH_CHUNK_SIZE)
+            view = memoryview(buf)
+            with open(self.file_path, 'rb', buffering=0) as f:
+                # 재사용 버퍼에 직접 읽어 청크마다 bytes 객체를 만들지 않음
+                while not self.cancelled:
+                    n = f.readinto(buf)
+                    if not n:
+                        break
+                    hasher.update(view[:n])
+            
+            if self.cancelled:
+                self.signals.finished.emit("", "취소되었습니다.")
+            else:
+                self.signals.finished.emit(hasher.hexdigest(), "")
+        except Exception as e:
+            self.signals.finished.emit("", str(e))
+
+class DownloadPart:
+    """병렬 다운로드의 한 구간 (바이트 범위와 응답 객체)"""
+    
+    def __init__(self, reply, start, end):
+        self.reply = reply
+        self.start = start      # 구간 시작 오프셋
+        self.end = end          # 구간 마지막 바이트 오프셋 (포함)
+        self.offset = start     # 다음에 기록할 파일 오프셋
+        self.checked = False    # 206 응답 확인 여부
+        self.done = False
 
 class ModelDownloader(QDialog):
     """Whisper 모델 다운로드 다이얼로그"""
@@ -43,8 +136,10 @@ class ModelDownloader(QDialog):
         self.setGeometry(100, 100, 500, 200)
         self.setModal(True)
         
-        # 신호 객체 생성
-        self.signals = DownloadSignals()
+        # 네트워크 관리자 (Qt 이벤트 루프에서 비동기로 다운로드)
+        # 사용자가 모델을 고르는 동안 TLS 핸드셰이크를 미리 끝내 둠
+        self.network_manager = shared_network_manager()
+        self.network_manager.connectToHostEncrypted(MODEL_HOST)
         
         # 앱 루트 디렉토리 (모델 저장 위치)
         self.app_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -59,7 +154,24 @@ class ModelDownloader(QDialog):
         
         # 다운로드 중인지 여부
         self.is_downloading = False
-        self.download_thread = None
+        self.reply = None
+        self.parts = []
+        self.model_file = None
+        self.model_path = None
+        self.download_url = None
+        self.total_size = 0
+        self.expected_sha256 = None  # 서버가 알려준 파일 해시 (없으면 검증 생략)
+        self.hasher = None  # 단일 연결 다운로드 시 기록과 함께 계산하는 해시
+        self.hash_task = None  # 병렬 다운로드 후 파일 해시를 계산하는 작업
+        
+        # 병렬 다운로드 진행 상황 샘플링 타이머
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(100)
+        self.progress_timer.timeout.connect(self.on_parts_progress)
+        
+        # 진행 상황 갱신 제한 (마지막으로 표시한 진행률과 시각)
+        self._last_progress = -1
+        self._last_progress_time = 0.0
         
         # UI 초기화
         self.init_ui()
@@ -74,8 +186,7 @@ class ModelDownloader(QDialog):
         self.model_combo = QComboBox()
         
         # 모델 목록 추가
-        for model_code, model_desc in AVAILABLE_MODELS:
-            self.model_combo.addItem(f"{model_desc}", model_code)
+        self.model_combo.addItems(_MODEL_DISPLAY)
         
         model_layout.addWidget(model_label)
         model_layout.addWidget(self.model_combo, 1)
@@ -118,11 +229,6 @@ class ModelDownloader(QDialog):
         layout.addLayout(button_layout)
         
         self.setLayout(layout)
-        
-        # 신호 연결
-        self.signals.progress.connect(self.update_progress)
-        self.signals.finished.connect(self.download_finished)
-        self.signals.status.connect(self.update_status)
     
     def browse_path(self):
         """저장 경로 선택 대화상자"""
@@ -137,23 +243,28 @@ class ModelDownloader(QDialog):
             return
         
         # 모델 정보 가져오기
-        model_code = self.model_combo.currentData()
+        model_code = _MODEL_CODES[self.model_combo.currentIndex()]
         model_desc = self.model_combo.currentText()
         
-        # 저장 경로 확인
-        if not os.path.exists(self.models_dir):
-            try:
-                os.makedirs(self.models_dir)
-            except Exception as e:
-                QMessageBox.critical(self, "오류", f"저장 경로를 생성할 수 없습니다: {str(e)}")
-                return
+        # 저장 경로 확인 (이미 있으면 그대로 사용)
+        try:
+            os.makedirs(self.models_dir, exist_ok=True)
+        except Exception as e:
+            QMessageBox.critical(self, "오류", f"저장 경로를 생성할 수 없습니다: {str(e)}")
+            return
         
         # 파일명 생성
         model_filename = f"ggml-{model_code}.bin"
         model_path = os.path.join(self.models_dir, model_filename)
         
-        # 파일이 이미 존재하는지 확인
-        if os.path.exists(model_path):
+        # 파일이 이미 존재하는지 확인 (stat 한 번으로 판단)
+        try:
+            os.stat(model_path)
+            model_exists = True
+        except FileNotFoundError:
+            model_exists = False
+        
+        if model_exists:
             reply = QMessageBox.question(
                 self, "파일 존재", 
                 f"모델 파일이 이미 존재합니다. 덮어쓰시겠습니까?\n{model_path}",
@@ -173,71 +284,276 @@ class ModelDownloader(QDialog):
         self.cancel_btn.clicked.disconnect()
         self.cancel_btn.clicked.connect(self.cancel_download)
         
-        # 다운로드 시작 (스레드에서 실행)
-        self.signals.status.emit(f"{model_desc} 다운로드 준비 중...")
-        self.download_thread = threading.Thread(
-            target=self.download_model,
-            args=(model_code, model_path)
-        )
-        self.download_thread.daemon = True
-        self.download_thread.start()
+        # 다운로드 시작 (Qt 이벤트 루프에서 비동기로 진행)
+        self.update_status(f"{model_desc} 다운로드 준비 중...")
+        self.download_model(model_code, model_path)
     
     def download_model(self, model_code, model_path):
-        """모델 다운로드 스레드"""
-        try:
-            # Hugging Face URL 생성
-            url = f"https://huggingface.co/ggerganov/whisper.cpp/resolve/main/ggml-{model_code}.bin"
-            self.signals.status.emit(f"다운로드 중: {url}")
-            
-            # Requests로 다운로드 (Progress 추적 기능 포함)
-            response = requests.get(url, stream=True)
-            response.raise_for_status()  # HTTP 오류 확인
-            
-            # 파일 크기 계산
-            total_size = int(response.headers.get('content-length', 0))
-            block_size = 1024 * 1024  # 1MB 단위로 다운로드
-            
-            # 파일 다운로드 및 진행 상황 업데이트
-            downloaded = 0
-            with open(model_path, 'wb') as f:
-                for data in response.iter_content(block_size):
-                    if not self.is_downloading:  # 취소 확인
-                        raise Exception("다운로드가 취소되었습니다.")
-                    
-                    # 데이터 쓰기
-                    f.write(data)
-                    downloaded += len(data)
-                    
-                    # 진행 상황 계산 및 업데이트
-                    if total_size > 0:
-                        progress = int((downloaded / total_size) * 100)
-                        self.signals.progress.emit(progress)
-                        
-                        # 다운로드 크기 표시
-                        downloaded_mb = downloaded / (1024 * 1024)
-                        total_mb = total_size / (1024 * 1024)
-                        self.signals.status.emit(f"다운로드 중: {downloaded_mb:.1f}MB / {total_mb:.1f}MB ({progress}%)")
-            
-            # 다운로드 완료 신호 전송
-            self.signals.finished.emit(True, model_path)
+        """모델 다운로드 시작 - 먼저 HEAD 요청으로 파일 크기와 범위 요청 지원 여부 확인"""
+        # Hugging Face URL 생성
+        url = f"https://{MODEL_HOST}/ggerganov/whisper.cpp/resolve/main/ggml-{model_code}.bin"
+        self.update_status(f"다운로드 중: {url}")
         
-        except Exception as e:
-            # 오류 발생 시 파일 삭제 시도
-            try:
-                if os.path.exists(model_path):
-                    os.remove(model_path)
-            except:
-                pass
+        # 진행 상황 갱신 상태 초기화
+        self._last_progress = -1
+        self._last_progress_time = 0.0
+        
+        # 저장할 파일 열기
+        self.model_path = model_path
+        self.model_file = QFile(model_path)
+        if not self.model_file.open(QIODevice.OpenModeFlag.WriteOnly | QIODevice.OpenModeFlag.Truncate):
+            self.download_finished(False, f"파일을 열 수 없습니다: {self.model_file.errorString()}")
+            return
+        
+        # 파일 정보 요청 - 첫 응답의 해시 헤더를 읽기 위해 리다이렉트는 직접 처리
+        self.expected_sha256 = None
+        self.send_head(QUrl(url), follow_redirects=False)
+    
+    def send_head(self, url, follow_redirects=True):
+        """HEAD 요청 전송"""
+        request = QNetworkRequest(url)
+        if not follow_redirects:
+            request.setAttribute(QNetworkRequest.Attribute.RedirectPolicyAttribute,
+                                 QNetworkRequest.RedirectPolicy.ManualRedirectPolicy)
+        self.reply = self.network_manager.head(request)
+        self.reply.finished.connect(self.on_head_finished)
+    
+    def on_head_finished(self):
+        """HEAD 응답에 따라 병렬 또는 단일 연결 다운로드 선택"""
+        reply = self.reply
+        self.reply = None
+        reply.deleteLater()
+        
+        if not self.is_downloading:
+            self.finish_download("다운로드가 취소되었습니다.")
+            return
+        if reply.error() != QNetworkReply.NetworkError.NoError:
+            self.finish_download(reply.errorString())
+            return
+        
+        # 리다이렉트 응답이면 해시를 기록하고 최종 위치로 다시 요청
+        target = reply.attribute(QNetworkRequest.Attribute.RedirectionTargetAttribute)
+        if target is not None:
+            etag = bytes(reply.rawHeader(b"X-Linked-Etag")).decode('latin-1')
+            etag = etag.strip().removeprefix('W/').strip('"').lower()
+            if _SHA256_RE.match(etag):
+                self.expected_sha256 = etag
+            self.send_head(reply.url().resolved(target))
+            return
+        
+        # 리다이렉트가 반영된 최종 URL로 본 요청을 보냄
+        self.download_url = reply.url()
+        total = reply.header(QNetworkRequest.KnownHeaders.ContentLengthHeader)
+        accept_ranges = bytes(reply.rawHeader(b"Accept-Ranges")).decode('latin-1').strip().lower()
+        
+        if total and total >= PARALLEL_MIN_SIZE and accept_ranges == "bytes":
+            self.start_parallel_download(int(total))
+        else:
+            self.start_serial_download()
+    
+    def start_serial_download(self):
+        """단일 연결로 다운로드"""
+        self.hasher = hashlib.sha256() if self.expected_sha256 else None
+        self.reply = self.network_manager.get(QNetworkRequest(self.download_url))
+        self.reply.readyRead.connect(self.on_ready_read)
+        self.reply.downloadProgress.connect(self.on_download_progress)
+        self.reply.finished.connect(self.on_reply_finished)
+    
+    def start_parallel_download(self, total):
+        """파일을 여러 구간으로 나누어 범위 요청으로 동시에 다운로드"""
+        self.total_size = total
+        self.hasher = None
+        
+        # 전체 크기만큼 파일을 미리 할당하고 각 구간을 해당 오프셋에 기록
+        if not self.model_file.resize(total):
+            self.finish_download(f"파일 공간을 할당할 수 없습니다: {self.model_file.errorString()}")
+            return
+        
+        part_size = -(-total // PARALLEL_CONNECTIONS)
+        for start in range(0, total, part_size):
+            end = min(start + part_size, total) - 1
+            request = QNetworkRequest(self.download_url)
+            request.setRawHeader(b"Range", f"bytes={start}-{end}".encode('ascii'))
             
-            # 오류 신호 전송
-            self.signals.finished.emit(False, str(e))
+            part = DownloadPart(self.network_manager.get(request), start, end)
+            part.reply.readyRead.connect(partial(self.on_part_ready_read, part))
+            part.reply.finished.connect(partial(self.on_part_finished, part))
+            self.parts.append(part)
+        
+        self.progress_timer.start()
+    
+    def on_ready_read(self):
+        """수신된 데이터가 WRITE_CHUNK_SIZE 이상 쌓이면 한 번에 파일에 기록"""
+        if self.reply.bytesAvailable() >= WRITE_CHUNK_SIZE:
+            self.write_serial(self.reply.readAll())
+    
+    def write_serial(self, data):
+        """수신 데이터를 파일에 기록하면서 같은 패스에서 해시 갱신"""
+        if self.hasher:
+            self.hasher.update(data)
+        self.model_file.write(data)
+    
+    def on_part_ready_read(self, part):
+        """구간 데이터 수신 처리"""
+        if not self.check_part_status(part):
+            return
+        if part.reply.bytesAvailable() >= WRITE_CHUNK_SIZE:
+            self.write_part(part, part.reply.readAll())
+    
+    def check_part_status(self, part):
+        """서버가 범위 요청을 따르는지(206) 확인하고, 아니면 단일 연결로 전환"""
+        if part.checked:
+            return True
+        
+        status = part.reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute)
+        if status != 206:
+            self.abort_parts()
+            self.model_file.resize(0)
+            self.model_file.seek(0)
+            self.start_serial_download()
+            return False
+        
+        part.checked = True
+        return True
+    
+    def write_part(self, part, data):
+        """구간 데이터를 해당 파일 오프셋에 기록"""
+        self.model_file.seek(part.offset)
+        self.model_file.write(data)
+        part.offset += len(data)
+    
+    def on_part_finished(self, part):
+        """구간 다운로드 종료 처리"""
+        part.reply.deleteLater()
+        if part not in self.parts:
+            return  # 이미 중단된 구간
+        
+        if part.reply.error() != QNetworkReply.NetworkError.NoError:
+            self.abort_parts()
+            self.finish_download(part.reply.errorString())
+            return
+        if not self.check_part_status(part):
+            return
+        
+        # 남은 데이터 기록
+        self.write_part(part, part.reply.readAll())
+        part.done = True
+        
+        if all(p.done for p in self.parts):
+            incomplete = any(p.offset != p.end + 1 for p in self.parts)
+            self.parts = []
+            if incomplete:
+                self.finish_download("다운로드된 데이터가 불완전합니다.")
+            else:
+                self.on_download_progress(self.total_size, self.total_size)
+                self.finish_download()
+    
+    def on_parts_progress(self):
+        """병렬 다운로드 진행 상황 (각 구간의 수신량 합계)"""
+        received = sum(p.offset - p.start + (0 if p.done else p.reply.bytesAvailable()) for p in self.parts)
+        self.on_download_progress(received, self.total_size)
+    
+    def abort_parts(self):
+        """진행 중인 모든 구간 요청 중단"""
+        parts, self.parts = self.parts, []
+        self.progress_timer.stop()
+        for part in parts:
+            if not part.done:
+                part.reply.abort()
+    
+    def on_download_progress(self, received, total):
+        """다운로드 진행 상황 업데이트 (초당 최대 10회, 진행률이 바뀐 경우에만)"""
+        if total <= 0:
+            return
+        
+        progress = received * 100 // total
+        now = time.monotonic()
+        if progress == self._last_progress:
+            return
+        if progress < 100 and now - self._last_progress_time < 0.1:
+            return
+        
+        self._last_progress = progress
+        self._last_progress_time = now
+        self.update_progress(progress)
+        
+        # 다운로드 크기 표시 (갱신 시점에만 문자열 생성)
+        downloaded_mb = received / (1024 * 1024)
+        total_mb = total / (1024 * 1024)
+        self.update_status(f"다운로드 중: {downloaded_mb:.1f}MB / {total_mb:.1f}MB ({progress}%)")
+    
+    def on_reply_finished(self):
+        """단일 연결 다운로드 종료 처리"""
+        reply = self.reply
+        self.reply = None
+        reply.deleteLater()
+        
+        if not self.is_downloading:
+            self.finish_download("다운로드가 취소되었습니다.")
+        elif reply.error() != QNetworkReply.NetworkError.NoError:
+            self.finish_download(reply.errorString())
+        else:
+            # 남은 데이터 기록
+            self.write_serial(reply.readAll())
+            self.finish_download()
+    
+    def finish_download(self, error=None):
+        """파일을 닫고 결과 전달 (병렬 다운로드는 작업 스레드에서 해시를 검증한 뒤 전달)"""
+        self.progress_timer.stop()
+        self.model_file.close()
+        
+        if not error and self.expected_sha256:
+            if self.hasher:
+                error = self.verify_digest(self.hasher.hexdigest())
+            else:
+                # 병렬 다운로드는 구간이 순서 없이 기록되므로 완료 후 파일 전체를 작업 스레드에서 해시
+                self.update_status("파일 무결성 검사 중...")
+                self.hash_task = FileHashRunnable(self.model_path)
+                self.hash_task.signals.finished.connect(self.on_hash_finished)
+                QThreadPool.globalInstance().start(self.hash_task)
+                return
+        
+        self.complete_download(error)
+    
+    def on_hash_finished(self, digest, hash_error):
+        """작업 스레드의 파일 해시 계산이 끝난 후 검증하고 다운로드 마무리"""
+        self.hash_task = None
+        if not self.is_downloading:
+            error = "다운로드가 취소되었습니다."
+        elif hash_error:
+            error = f"파일 무결성 검사 실패: {hash_error}"
+        else:
+            error = self.verify_digest(digest)
+        self.complete_download(error)
+    
+    def complete_download(self, error=None):
+        """검증까지 끝난 다운로드 결과 전달 (오류 시 파일 삭제)"""
+        if error:
+            self.model_file.remove()
+            self.download_finished(False, error)
+        else:
+            invalidate_cache()  # 새 파일이 생겼으므로 파일 탐색 캐시 갱신
+            self.download_finished(True, self.model_path)
+    
+    def verify_digest(self, digest):
+        """다운로드한 파일의 SHA-256을 예상 값과 비교하고, 불일치 시 오류 메시지 반환"""
+        self.hasher = None
+        if digest != self.expected_sha256:
+            return f"다운로드한 파일이 손상되었습니다 (SHA-256 불일치).\n예상: {self.expected_sha256}\n실제: {digest}"
+        return None
     
     def cancel_download(self):
         """다운로드 취소"""
         if self.is_downloading:
             self.is_downloading = False
-            self.signals.status.emit("다운로드 취소 중...")
-            # 스레드는 is_downloading 플래그를 확인하고 종료됨
+            self.update_status("다운로드 취소 중...")
+            if self.reply:
+                self.reply.abort()  # finished 신호가 발생하며 정리됨
+            elif self.parts:
+                self.abort_parts()
+                self.finish_download("다운로드가 취소되었습니다.")
+            elif self.hash_task:
+                self.hash_task.cancel()  # on_hash_finished에서 정리됨
     
     def update_progress(self, value):
         """진행 상황 바 업데이트"""
@@ -258,7 +574,7 @@ class ModelDownloader(QDialog):
         self.cancel_btn.clicked.connect(self.close)
         
         if success:
-            self.signals.status.emit(f"다운로드 완료: {message}")
+            self.update_status(f"다운로드 완료: {message}")
             QMessageBox.information(self, "다운로드 성공", f"모델이 성공적으로 다운로드되었습니다.\n{message}")
             
             # 부모 창에 다운로드된 모델 정보 전달
@@ -268,7 +584,7 @@ class ModelDownloader(QDialog):
             # 다이얼로그 닫기
             self.accept()
         else:
-            self.signals.status.emit(f"다운로드 실패: {message}")
+            self.update_status(f"다운로드 실패: {message}")
             QMessageBox.critical(self, "다운로드 실패", f"모델 다운로드에 실패했습니다.\n오류: {message}")
     
     def closeEvent(self, event):
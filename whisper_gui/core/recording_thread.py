@@ -40,29 +40,34 @@ class RecordingThread(QThread):
                            rate=RATE, input=True,
                            frames_per_buffer=CHUNK)
         
-        frames = []
-        for i in range(0, int(RATE / CHUNK * self.max_duration)):
+        # WAV 파일을 먼저 열고 청크를 받는 즉시 기록 (메모리에 누적하지 않음)
+        wf = wave.open(self.temp_file, 'wb')
+        wf.setnchannels(CHANNELS)
+        wf.setsampwidth(audio.get_sample_size(FORMAT))
+        wf.setframerate(RATE)
+        
+        total_chunks = int(RATE / CHUNK * self.max_duration)
+        last_progress = -1
+        
+        for i in range(0, total_chunks):
             if not self.is_recording:
                 break
             
-            data = stream.read(CHUNK)
-            frames.append(data)
+            data = stream.read(CHUNK, exception_on_overflow=False)
+            wf.writeframesraw(data)
             
-            # 진행 상황 업데이트 (0-100%)
-            progress = int((i / (RATE / CHUNK * self.max_duration)) * 100)
-            self.update_progress.emit(progress)
+            # 진행 상황 업데이트 (0-100%, 값이 바뀐 경우에만 신호 발생)
+            progress = i * 100 // total_chunks
+            if progress != last_progress:
+                last_progress = progress
+                self.update_progress.emit(progress)
         
         # 스트림 닫기
         stream.stop_stream()
         stream.close()
         audio.terminate()
         
-        # WAV 파일로 저장
-        wf = wave.open(self.temp_file, 'wb')
-        wf.setnchannels(CHANNELS)
-        wf.setsampwidth(audio.get_sample_size(FORMAT))
-        wf.setframerate(RATE)
-        wf.writeframes(b''.join(frames))
+        # WAV 헤더의 길이 정보 갱신 후 파일 닫기
         wf.close()
         
         # 완료 신호 보내기
@@ -1,75 +1,234 @@
 """
-TranscriptionThread class - Handles audio transcription in a background thread.
+TranscriptionRunnable class - Handles audio transcription on a thread pool worker.
 """
 
-import wave
+import logging
+import mmap
+import struct
 import numpy as np
 import ctypes
 import time
-from PyQt6.QtCore import QThread, pyqtSignal
+import soundfile as sf
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
 
-class TranscriptionThread(QThread):
-   """음성 인식을 위한 스레드 클래스"""
-   finished = pyqtSignal(str)
-   progress = pyqtSignal(str)  # 실시간 텍스트 진행 상황 신호
+from ._audio_kernels import pcm16_to_f32_mono, resample
+from .whisper_dll import WHISPER_SAMPLE_RATE
+
+log = logging.getLogger(__name__)
+
+def _find_pcm16_wav_data(mm):
+   """
+   16비트 PCM WAV의 RIFF 청크를 탐색하여 (채널 수, 샘플링 레이트, data 오프셋, data 크기)를 반환합니다.
+   16비트 PCM WAV가 아니면 None을 반환합니다.
+   """
+   if len(mm) < 12 or mm[0:4] != b'RIFF' or mm[8:12] != b'WAVE':
+       return None
+   
+   fmt = None
+   pos = 12
+   while pos + 8 <= len(mm):
+       chunk_id = mm[pos:pos + 4]
+       chunk_size = struct.unpack_from('<I', mm, pos + 4)[0]
+       body = pos + 8
+       if chunk_id == b'fmt ' and chunk_size >= 16:
+           fmt = struct.unpack_from('<HHIIHH', mm, body)
+       elif chunk_id == b'data':
+           if fmt is None:
+               return None
+           format_tag, channels, rate, _, _, bits = fmt
+           if format_tag != 1 or bits != 16 or channels < 1:
+               return None
+           # 녹음 중단 등으로 헤더 크기가 실제보다 클 수 있으므로 파일 길이로 제한
+           size = min(chunk_size, len(mm) - body)
+           return channels, rate, body, size - size % (2 * channels)
+       pos = body + chunk_size + (chunk_size & 1)
+   return None
+
+class TranscriptionSignals(QObject):
+   """음성 인식 작업의 결과를 전달하는 신호 (QRunnable은 신호를 가질 수 없음)"""
+   model_loaded = pyqtSignal()  # 작업 스레드에서 모델 로드 완료
+   load_error = pyqtSignal(str)  # 모델 로드 실패 (인식은 시작하지 않음)
+   finished = pyqtSignal(str, bool)  # (텍스트, True면 progress로 보낸 텍스트 뒤에 이어 붙일 나머지만 / False면 전체 결과)
+   progress = pyqtSignal(str)  # 실시간 텍스트 진행 상황 신호 (새로 추가된 세그먼트)
    progress_percent = pyqtSignal(int)  # 진행률(%) 신호 추가
    error = pyqtSignal(str)
+
+class TranscriptionRunnable(QRunnable):
+   """
+   음성 인식 작업 (QThreadPool의 작업 스레드를 재사용하여 실행)
+   
+   emit_progress/emit_percent를 끄면 해당 실시간 신호를 보내지 않고,
+   use_callback을 끄면 세그먼트 콜백 없이 인식하여 finished만 전달합니다.
+   beam_size=1이면 빔 탐색 대신 그리디 디코딩을 사용합니다.
+   model_path가 주어지고 모델이 아직 로드되지 않았으면 인식 전에 작업 스레드에서 로드하여,
+   수 초가 걸리는 모델 로드 동안에도 UI가 멈추지 않도록 합니다.
+   cancel()을 호출하면 다음 단계(또는 다음 30초 구간) 전에 멈추고 더 이상 신호를 보내지 않습니다.
+   """
    
-   def __init__(self, whisper, audio_file, language=None):
+   def __init__(self, whisper, audio_file, language=None,
+                emit_progress=True, emit_percent=True, use_callback=True, beam_size=5, model_path=None):
        super().__init__()
+       self.signals = TranscriptionSignals()
        self.whisper = whisper
        self.audio_file = audio_file
+       self.model_path = model_path
        self.language = language
-       self.current_text = ""  # 현재까지의 인식 결과 저장
+       self.beam_size = beam_size  # 빔 크기 (1: 그리디)
+       self.emit_progress = emit_progress  # 새 세그먼트 텍스트 신호 사용 여부
+       self.emit_percent = emit_percent  # 진행률(%) 신호 사용 여부
+       self.use_callback = use_callback and (emit_progress or emit_percent)  # 세그먼트 콜백 사용 여부
        self.total_segments = 0  # 예상 세그먼트 총 개수
        self.current_segment = 0  # 현재 처리한 세그먼트 수
+       self.last_percent = -1  # 마지막으로 보낸 진행률 (같은 값은 다시 보내지 않음)
+       self._f32_buf = None  # 정규화된 오디오를 담는 재사용 float32 버퍼
+       self.cancelled = False  # 취소 요청 여부 (cancel)
+       self.streamed = []  # progress 신호로 보낸 텍스트 조각 (완료 시 나머지만 보내기 위해 보관)
+   
+   def cancel(self):
+       """작업 취소 요청 (UI 스레드에서 호출, 진행 중인 인식은 다음 구간 전에 중단)"""
+       self.cancelled = True
+       self.whisper.request_abort()
+   
+   def _unsent_text(self, text):
+       """
+       최종 결과 중 progress 신호로 보내지 않은 나머지를 반환합니다.
+       보낸 텍스트가 결과의 앞부분과 일치하지 않으면 None을 반환합니다.
+       """
+       if not self.streamed:
+           return None
+       
+       streamed = "\n".join(self.streamed)
+       if text.startswith(streamed):
+           return text[len(streamed):].lstrip("\n")
+       if streamed.rstrip() == text:  # 최종 결과는 끝의 공백이 제거됨
+           return ""
+       return None
+   
+   def _pcm_to_float32(self, pcm, n_channels):
+       """int16 PCM을 재사용 float32 버퍼에 모노로 다운믹스·정규화하여 기록합니다."""
+       n_frames = len(pcm) // n_channels
+       if self._f32_buf is None or self._f32_buf.size < n_frames:
+           self._f32_buf = np.empty(n_frames, dtype=np.float32)
+       
+       return pcm16_to_f32_mono(pcm, n_channels, self._f32_buf[:n_frames])
+   
+   def _load_pcm16_wav(self):
+       """
+       16비트 PCM WAV를 mmap으로 열어 복사 없이 변환합니다.
+       다른 형식이면 None을 반환합니다.
+       """
+       with open(self.audio_file, 'rb') as f:
+           try:
+               mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+           except ValueError:  # 빈 파일
+               return None
+       
+       try:
+           info = _find_pcm16_wav_data(mm)
+           if info is None:
+               return None
+           
+           channels, rate, offset, size = info
+           pcm = np.frombuffer(mm, dtype=np.int16, count=size // 2, offset=offset)
+           audio_data = self._pcm_to_float32(pcm, channels)
+           del pcm  # mmap을 닫기 전에 버퍼 참조 해제
+           return audio_data, rate
+       finally:
+           mm.close()
    
    def run(self):
        """음성 인식 실행"""
        try:
-           # 오디오 파일 로드
-           wf = wave.open(self.audio_file, 'rb')
+           # 이전 작업에서 남은 중단 요청 해제 후 시작 전에 취소되었는지 확인
+           self.whisper.reset_abort()
+           if self.cancelled:
+               return
            
-           # 오디오 파일 길이 계산 (초 단위)
-           audio_length_sec = wf.getnframes() / wf.getframerate()
+           # 모델이 로드되지 않은 경우 먼저 로드 (DLL 호출 중에는 GIL이 해제되어 UI 스레드가 계속 동작)
+           if self.model_path and not self.whisper.ctx:
+               try:
+                   self.whisper.load_model(self.model_path)
+               except Exception as e:
+                   self.signals.load_error.emit(str(e))
+                   return
+               self.signals.model_loaded.emit()
+           if self.cancelled:
+               return
+           
+           # 오디오 파일 로드: 16비트 PCM WAV는 mmap으로 바로 변환하고,
+           # 그 외 형식은 libsndfile이 float32로 디코딩
+           loaded = self._load_pcm16_wav()
+           if loaded is not None:
+               audio_data, sample_rate = loaded
+           else:
+               audio_data, sample_rate = sf.read(self.audio_file, dtype='float32', always_2d=False)
+               
+               # 스테레오인 경우 모노로 변환
+               if audio_data.ndim > 1:
+                   audio_data = audio_data.mean(axis=1, dtype=np.float32)
            
            # 예상 세그먼트 수 추정 (대략 5초당 1개 세그먼트로 가정)
+           audio_length_sec = len(audio_data) / sample_rate
            self.total_segments = max(1, int(audio_length_sec / 5))
            self.current_segment = 0
            
-           # 오디오 데이터 읽기
-           audio_data = np.frombuffer(
-               wf.readframes(wf.getnframes()),
-               dtype=np.int16
-           ).astype(np.float32) / 32768.0  # 정규화
+           # Whisper는 16kHz 입력만 받으므로 다른 샘플링 레이트는 리샘플링
+           if sample_rate != WHISPER_SAMPLE_RATE:
+               audio_data = resample(audio_data, sample_rate, WHISPER_SAMPLE_RATE)
+           
+           # 디버그 로그가 켜져 있을 때만 통계 계산 (min/max는 전체 배열을 한 번 더 순회)
+           if log.isEnabledFor(logging.DEBUG):
+               log.debug("오디오 로드: %d 샘플 (원본 %d Hz), min=%s, max=%s",
+                         len(audio_data), sample_rate, np.min(audio_data), np.max(audio_data))
            
            # 초기 진행률 신호 발생
-           self.progress_percent.emit(0)
+           if self.emit_percent:
+               self.last_percent = 0
+               self.signals.progress_percent.emit(0)
            
-           # 콜백 함수 정의
-           @self.whisper.WHISPER_NEW_SEGMENT_CALLBACK
-           def new_segment_callback(ctx, state, n_new, user_data):
-               try:
-                   # 새 세그먼트의 텍스트와 타임스탬프 가져오기
-                   current_segments = self.whisper.get_current_segments()
-                   
-                   # 현재 세그먼트 수 증가
-                   self.current_segment += n_new
-                   
-                   # 진행률 계산 및 신호 발생
-                   progress = min(95, int((self.current_segment / self.total_segments) * 100))
-                   self.progress_percent.emit(progress)
-                   
-                   # 실시간 텍스트 업데이트 신호 발생
-                   self.progress.emit(current_segments)
-               except Exception as e:
-                   print(f"콜백 오류: {str(e)}")
-
-           # 콜백과 함께 인식 수행
-           text = self.whisper.transcribe(audio_data, self.language, new_segment_callback)
+           # 콜백 함수 정의 (실시간 신호를 하나도 쓰지 않으면 생략)
+           # 콜백은 디코더 스레드에서 GIL을 잡은 채 실행되므로 새 세그먼트를 읽어 신호로 넘기는 일만 수행
+           # (세그먼트 결과는 디코딩 중 계속 늘어나므로 다른 스레드에서 읽으면 안 됨)
+           new_segment_callback = None
+           if self.use_callback:
+               def new_segment_callback(ctx, state, n_new, user_data):
+                   if self.cancelled:
+                       return
+                   try:
+                       # 현재 세그먼트 수 증가
+                       self.current_segment += n_new
+                       
+                       # 진행률 계산 및 신호 발생 (값이 바뀐 경우에만 UI 스레드로 이벤트를 보냄)
+                       if self.emit_percent:
+                           progress = min(95, int((self.current_segment / self.total_segments) * 100))
+                           if progress != self.last_percent:
+                               self.last_percent = progress
+                               self.signals.progress_percent.emit(progress)
+                       
+                       # 새로 추가된 세그먼트만 가져와 실시간 텍스트 업데이트 신호 발생
+                       if self.emit_progress:
+                           new_segments = self.whisper.get_new_segments(n_new)
+                           if new_segments:
+                               self.signals.progress.emit(new_segments)
+                               self.streamed.append(new_segments)
+                   except Exception as e:
+                       log.error("콜백 오류: %s", e)
+           
+           # 인식 수행
+           text = self.whisper.transcribe(audio_data, self.language, new_segment_callback, self.beam_size)
+           if self.cancelled:  # 중단된 경우 일부 결과는 전달하지 않음
+               return
            
            # 완료 시 100% 진행률 설정
-           self.progress_percent.emit(100)
-           self.finished.emit(text)
+           if self.emit_percent:
+               self.signals.progress_percent.emit(100)
+           
+           # 실시간으로 이미 보낸 부분은 다시 보내지 않음 (긴 결과 전체를 스레드 간에 복사하지 않도록)
+           rest = self._unsent_text(text)
+           if rest is None:
+               self.signals.finished.emit(text, False)
+           else:
+               self.signals.finished.emit(rest, True)
        except Exception as e:
-           self.error.emit(str(e))
\ No newline at end of file
+           if not self.cancelled:
+               self.signals.error.emit(str(e))
\ No newline at end of file
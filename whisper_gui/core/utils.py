@@ -3,6 +3,82 @@ Utility functions for the Whisper GUI application
 """
 
 import os
+import functools
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB')
+
+# 앱 루트 디렉토리 (whisper_gui 패키지의 상위, DLL 파일과 models 폴더가 위치하는 곳)
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def _dir_mtime_ns(directory):
+    """디렉터리의 수정 시각(ns)을 반환합니다. 디렉터리가 없으면 None을 반환합니다."""
+    try:
+        return os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+
+@functools.lru_cache(maxsize=16)
+def _dir_listing(directory, mtime_ns):
+    """
+    (디렉터리, 수정 시각) 별로 디렉터리의 파일 이름 집합(소문자)을 캐시합니다.
+    os.scandir 한 번으로 목록을 만들고, 이후 존재 여부는 메모리에서 확인합니다.
+    (Windows 파일 시스템은 대소문자를 구분하지 않으므로 소문자로 비교)
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return frozenset(entry.name.lower() for entry in entries if entry.is_file())
+    except OSError:
+        return frozenset()
+
+def list_dir_cached(directory):
+    """
+    디렉터리의 파일 이름 집합(소문자)을 반환합니다.
+    수정 시각이 바뀌지 않았으면 캐시된 목록을 사용하므로, 여러 파일의 존재 여부를
+    stat 한 번과 메모리 검사만으로 확인할 수 있습니다.
+    
+    Args:
+        directory (str): 검사할 디렉터리
+        
+    Returns:
+        frozenset: 소문자 파일 이름 집합 (디렉터리가 없으면 빈 집합)
+    """
+    mtime_ns = _dir_mtime_ns(directory)
+    if mtime_ns is None:
+        return frozenset()
+    return _dir_listing(directory, mtime_ns)
+
+@functools.lru_cache(maxsize=16)
+def _dir_file_sizes(directory, mtime_ns):
+    """
+    (디렉터리, 수정 시각) 별로 디렉터리의 (파일 이름, 크기) 목록을 캐시합니다.
+    크기는 DirEntry.stat()에서 읽으므로 (Windows에서는 scandir 결과에 포함) 파일마다 stat을 다시 호출하지 않습니다.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return tuple(sorted((entry.name, entry.stat().st_size) for entry in entries if entry.is_file()))
+    except OSError:
+        return ()
+
+def list_file_sizes_cached(directory):
+    """
+    디렉터리의 파일 이름과 크기 목록을 반환합니다.
+    수정 시각이 바뀌지 않았으면(파일 추가·삭제·이름 변경이 없으면) 캐시된 목록을 사용합니다.
+    
+    Args:
+        directory (str): 검사할 디렉터리
+        
+    Returns:
+        tuple: 이름순으로 정렬된 (파일 이름, 크기(바이트)) 튜플 (디렉터리가 없으면 빈 튜플)
+    """
+    mtime_ns = _dir_mtime_ns(directory)
+    if mtime_ns is None:
+        return ()
+    return _dir_file_sizes(directory, mtime_ns)
+
+def invalidate_cache():
+    """파일 탐색 캐시를 비웁니다 (예: 다운로드 완료 후)."""
+    _dir_listing.cache_clear()
+    _dir_file_sizes.cache_clear()
 
 def find_dll_file(directory, possible_names):
     """
@@ -15,11 +91,9 @@ def find_dll_file(directory, possible_names):
     Returns:
         str or None: Path to the found DLL file, or None if not found
     """
-    for name in possible_names:
-        path = os.path.join(directory, name)
-        if os.path.exists(path):
-            return path
-    return None
+    present = list_dir_cached(directory)
+    found = next((name for name in possible_names if name.lower() in present), None)
+    return os.path.join(directory, found) if found else None
 
 def check_required_dlls(directory, required_dlls):
     """
@@ -33,11 +107,8 @@ def check_required_dlls(directory, required_dlls):
         tuple: (missing_dlls, status) where missing_dlls is a list of missing DLL files
                and status is True if all required DLLs are found, False otherwise
     """
-    missing_dlls = []
-    
-    for dll in required_dlls:
-        if not os.path.exists(os.path.join(directory, dll)):
-            missing_dlls.append(dll)
+    present = list_dir_cached(directory)
+    missing_dlls = [dll for dll in required_dlls if dll.lower() not in present]
     
     return missing_dlls, len(missing_dlls) == 0
 
@@ -52,7 +123,6 @@ def get_file_size_str(file_path):
         str: File size in human-readable format (e.g. "15.2 MB")
     """
     size_bytes = os.path.getsize(file_path)
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024 or unit == 'GB':
-            return f"{size_bytes:.2f} {unit}"
-        size_bytes /= 1024
\ No newline at end of file
+    # 비트 길이로 단위를 바로 계산 (1024 = 2^10)
+    idx = min(3, max(0, (size_bytes.bit_length() - 1) // 10))
+    return f"{size_bytes / (1 << (idx * 10)):.2f} {_SIZE_UNITS[idx]}"
\ No newline at end of file
@@ -3,15 +3,121 @@ WhisperDLL class - Interface for the Whisper speech recognition DLL
 """
 
 import os
+import time
+import queue
+import struct
 import ctypes
+import ctypes.util
+import logging
+import threading
+import weakref
+from itertools import repeat
 import numpy as np
 
+from ._audio_kernels import pcm16_to_f32_mono, resample, to_float32_normalize
+from .utils import APP_ROOT, find_dll_file, check_required_dlls, list_dir_cached
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+log = logging.getLogger(__name__)
+
 # ggml.h 및 whisper.h에서 정의된 상수와 타입
 WHISPER_SAMPLE_RATE = 16000
 WHISPER_N_FFT = 400
 WHISPER_HOP_LENGTH = 160
 WHISPER_CHUNK_SIZE = 30
 
+# whisper DLL로 인식하는 파일 이름 (앞쪽이 우선)
+WHISPER_DLL_NAMES = ("whisper.dll", "whisper_cpp.dll", "whisper-cpp.dll", "whisperdll.dll")
+
+# whisper.dll과 ggml.dll이 암시적으로 링크하는 GGML DLL (없으면 CPU 모드에서도 whisper.dll을 로드할 수 없음)
+GGML_CORE_DLLS = ("ggml.dll", "ggml-base.dll", "ggml-cpu.dll", "ggml-vulkan.dll")
+
+# GGML DLL이 의존하는 시스템 DLL (앱 디렉토리가 아닌 시스템 경로에서 로드됨): 설치해야 하는 구성 요소
+SYSTEM_DLLS = {
+    "vulkan-1.dll": "Vulkan 런타임 (그래픽 드라이버에 포함)",
+    "msvcp140.dll": "Microsoft Visual C++ 재배포 패키지",
+    "vcruntime140_1.dll": "Microsoft Visual C++ 재배포 패키지",
+    "vcomp140.dll": "Microsoft Visual C++ 재배포 패키지 (OpenMP)",
+}
+
+def missing_system_dlls():
+    """SYSTEM_DLLS 중 DLL 검색 경로(PATH)에서 찾을 수 없는 DLL 목록을 반환합니다 (Windows 이외에서는 빈 목록)."""
+    if os.name != 'nt':
+        return []
+    return [dll for dll in SYSTEM_DLLS if ctypes.util.find_library(dll) is None]
+
+# 선택 가능한 GPU 백엔드 (백엔드 이름: (GGML 백엔드 DLL, ggml 등록 이름)), "cpu"는 GPU 백엔드 없이 실행
+# 함께 배포하는 ggml.dll은 ggml-cpu.dll과 ggml-vulkan.dll에만 링크되어 있어 ggml-cuda.dll 등을
+# 옆에 두어도 로드되지 않으므로, 해당 백엔드로 빌드한 ggml.dll을 배포할 때만 항목을 추가
+GPU_BACKENDS = {
+    "vulkan": ("ggml-vulkan.dll", "Vulkan"),
+}
+
+def available_backends(directory=APP_ROOT, present=None):
+    """
+    directory에 백엔드 DLL이 있는 GPU 백엔드 이름 목록을 GPU_BACKENDS 순서대로 반환합니다.
+    present에 이미 읽은 디렉터리 목록(list_dir_cached의 결과)을 넘기면 다시 조회하지 않습니다.
+    """
+    if present is None:
+        present = list_dir_cached(directory)
+    return [backend for backend, (dll_name, _) in GPU_BACKENDS.items() if dll_name.lower() in present]
+
+def ggml_device_count(dll_dir, backend):
+    """
+    로드된 ggml에 GPU 백엔드가 등록되어 있으면 그 백엔드의 장치 수를, 등록되어 있지 않으면 0을 반환합니다.
+    whisper.dll을 로드한 뒤 호출해야 하며 (이미 로드된 ggml.dll과 ggml-base.dll을 다시 열어 조회),
+    레지스트리 API가 없는 ggml이면 None을 반환합니다.
+    """
+    try:
+        ggml = ctypes.CDLL(os.path.join(dll_dir, "ggml.dll"))
+        ggml_base = ctypes.CDLL(os.path.join(dll_dir, "ggml-base.dll"))
+        reg_by_name = ggml.ggml_backend_reg_by_name
+        reg_dev_count = ggml_base.ggml_backend_reg_dev_count
+    except (OSError, AttributeError):
+        return None
+    
+    reg_by_name.argtypes = [ctypes.c_char_p]
+    reg_by_name.restype = ctypes.c_void_p
+    reg_dev_count.argtypes = [ctypes.c_void_p]
+    reg_dev_count.restype = ctypes.c_size_t
+    
+    reg = reg_by_name(GPU_BACKENDS[backend][1].encode('utf-8'))
+    return reg_dev_count(reg) if reg else 0
+
+def backend_label(backend):
+    """백엔드 이름의 가속 모드 표시 이름을 반환합니다 (예: "vulkan" -> "Vulkan GPU")."""
+    return f"{GPU_BACKENDS[backend][1]} GPU" if backend in GPU_BACKENDS else "CPU"
+
+# CPU 모드에서 whisper_full_parallel로 나누어 처리하는 기준
+PARALLEL_MIN_SAMPLES = 2 * WHISPER_CHUNK_SIZE * WHISPER_SAMPLE_RATE  # 이보다 긴 오디오만 분할 (60초)
+PARALLEL_MIN_THREADS = 4  # 분할된 조각 하나가 사용하는 최소 스레드 수
+
+# 디코딩 스레드 수 상한 (whisper.cpp는 이 이상에서 거의 빨라지지 않음)
+MAX_N_THREADS = 16
+
+def default_n_threads(gpu=False):
+    """
+    물리 코어 수를 기준으로 whisper 스레드 수를 정합니다.
+    WHISPER_N_THREADS 환경 변수가 있으면 그 값을 사용하며,
+    GPU 가속 시에는 CPU가 샘플링 등만 담당하므로 절반만 사용합니다.
+    """
+    env_threads = os.environ.get("WHISPER_N_THREADS")
+    if env_threads:
+        try:
+            return max(1, min(MAX_N_THREADS, int(env_threads)))
+        except ValueError:
+            pass
+    
+    cores = (psutil.cpu_count(logical=False) if PSUTIL_AVAILABLE else None) or os.cpu_count() or 4
+    if gpu:
+        cores //= 2
+    return max(1, min(MAX_N_THREADS, cores))
+
 # ggml 관련 타입 정의
 class GgmlContext(ctypes.Structure):
     pass
@@ -50,6 +156,12 @@ WHISPER_ENCODER_BEGIN_CALLBACK = ctypes.CFUNCTYPE(ctypes.c_bool, ctypes.POINTER(
 GGML_ABORT_CALLBACK = ctypes.CFUNCTYPE(ctypes.c_bool, ctypes.c_void_p)
 WHISPER_LOGITS_FILTER_CALLBACK = ctypes.CFUNCTYPE(None, ctypes.POINTER(WhisperContext), ctypes.POINTER(WhisperState), ctypes.POINTER(WhisperTokenData), ctypes.c_int, ctypes.POINTER(ctypes.c_float), ctypes.c_void_p)
 
+# 콜백을 해제할 때 쓰는 NULL 함수 포인터 (호출마다 새로 만들지 않도록 미리 생성)
+NULL_SEGMENT_CALLBACK = WHISPER_NEW_SEGMENT_CALLBACK()
+
+# 세그먼트 시간 표기 형식 (시:분:초 -> 시:분:초, 세그먼트 텍스트와 같은 바이트열로 바로 생성)
+_SEGMENT_TIME_FMT = b"%02d:%02d:%02d -> %02d:%02d:%02d "
+
 # 샘플링 전략 열거형
 class WhisperSamplingStrategy(ctypes.c_int):
     WHISPER_SAMPLING_GREEDY = 0
@@ -156,66 +268,221 @@ class WhisperFullParams(ctypes.Structure):
         ("grammar_penalty", ctypes.c_float),
     ]
 
+# whisper_full_default_params가 채우는 기본값 중 구조체의 처음·끝 부근 필드 (whisper.cpp v1.7.x)
+# DLL이 돌려준 기본 파라미터에서 이 값이 다르면 구조체 정의가 DLL과 어긋나 필드가 잘못된 위치에 기록되므로 사용하지 않음
+WHISPER_PARAMS_LAYOUT_CHECK = (
+    ("n_max_text_ctx", 16384),
+    ("grammar_penalty", 100.0),
+)
+
+# DTW 토큰 타임스탬프용 어텐션 헤드 목록
+class WhisperAheads(ctypes.Structure):
+    _fields_ = [
+        ("n_heads", ctypes.c_size_t),
+        ("heads", ctypes.c_void_p),
+    ]
+
+# whisper_context_params 구조체 정의 (whisper.h 기반, 모델 로드 시 값으로 전달)
+class WhisperContextParams(ctypes.Structure):
+    _fields_ = [
+        ("use_gpu", ctypes.c_bool),                  # GPU 백엔드 사용
+        ("flash_attn", ctypes.c_bool),               # Flash Attention 사용
+        ("gpu_device", ctypes.c_int),                # 사용할 GPU 장치 번호
+        
+        # DTW 토큰 타임스탬프 (사용하지 않음)
+        ("dtw_token_timestamps", ctypes.c_bool),
+        ("dtw_aheads_preset", ctypes.c_int),
+        ("dtw_n_top", ctypes.c_int),
+        ("dtw_aheads", WhisperAheads),
+        ("dtw_mem_size", ctypes.c_size_t),
+    ]
+
+# Flash Attention을 기본으로 켜는 백엔드 (실제로 사용 중인 백엔드 기준)
+# (이 버전의 ggml-vulkan은 일반 GPU용 Flash Attention 커널이 없어 어텐션이 CPU로 넘어가므로 제외)
+FLASH_ATTN_BACKENDS = ("cpu",)
+
+# ggml 모델 파일 헤더: 매직 + hparams 11개(int32), ftype은 마지막 필드 (양자화 버전 * 1000 + 형식)
+GGML_FILE_MAGIC = 0x67676d6c
+GGML_QNT_VERSION_FACTOR = 1000
+GGML_FTYPE_NAMES = {
+    0: "F32", 1: "F16", 2: "Q4_0", 3: "Q4_1", 7: "Q8_0", 8: "Q5_0", 9: "Q5_1",
+    10: "Q2_K", 11: "Q3_K", 12: "Q4_K", 13: "Q5_K", 14: "Q6_K",
+}
+
+def read_model_ftype(model_path):
+    """
+    ggml 모델 파일 헤더에서 가중치 형식(양자화 종류)을 읽습니다.
+    
+    Args:
+        model_path (str): 모델 파일 경로
+    
+    Returns:
+        str or None: "F16", "Q5_1" 등의 형식 이름 (ggml 모델이 아니거나 읽을 수 없으면 None)
+    """
+    try:
+        with open(model_path, 'rb') as f:
+            header = f.read(48)
+    except OSError:
+        return None
+    
+    if len(header) < 48:
+        return None
+    magic, ftype = struct.unpack_from('<I', header, 0)[0], struct.unpack_from('<i', header, 44)[0]
+    if magic != GGML_FILE_MAGIC:
+        return None
+    ftype %= GGML_QNT_VERSION_FACTOR
+    return GGML_FTYPE_NAMES.get(ftype, f"ftype {ftype}")
+
+def _trim_trailing_silence(audio, sr=WHISPER_SAMPLE_RATE, threshold_db=-40.0, min_chunk_s=5.0, pad_s=0.2):
+    """
+    오디오 끝부분의 무음 구간을 잘라냅니다.
+    
+    20ms 창의 RMS가 threshold_db(dBFS) 이하인 구간을 끝에서부터 1초 단위로 역방향 탐색하므로
+    무음 꼬리만 읽습니다. 앞쪽 min_chunk_s초는 항상 유지하며, 마지막 음성 뒤에 pad_s초를 남깁니다.
+    """
+    win = int(sr * 0.02)
+    block = win * 50
+    min_len = int(sr * min_chunk_s)
+    if len(audio) <= min_len + block:
+        return audio
+    
+    # 창 내 제곱합 기준 임계값 (RMS^2 * 창 길이)
+    threshold = 10.0 ** (threshold_db / 10.0) * win
+    
+    end = len(audio)
+    cut = end
+    while end - block >= min_len:
+        frames = audio[end - block:end].reshape(-1, win)
+        loud = np.flatnonzero(np.einsum('ij,ij->i', frames, frames) > threshold)
+        if loud.size:
+            cut = end - block + (loud[-1] + 1) * win
+            break
+        end -= block
+    else:
+        cut = end  # 남은 앞부분은 그대로 유지
+    
+    return audio[:min(len(audio), cut + int(sr * pad_s))]
+
+def _make_segment_trampoline(owner):
+    """
+    owner의 현재 사용자 콜백으로 호출을 전달하는 C 콜백을 한 번만 생성합니다.
+    owner를 약한 참조로 잡아 순환 참조로 인해 해제(free_model)가 늦어지지 않도록 합니다.
+    """
+    owner_ref = weakref.ref(owner)
+    
+    def dispatch(ctx, state, n_new, user_data):
+        whisper = owner_ref()
+        if whisper is not None and whisper._user_callback is not None:
+            whisper._user_callback(ctx, state, n_new, user_data)
+    
+    return WHISPER_NEW_SEGMENT_CALLBACK(dispatch)
+
+def _make_encoder_begin_trampoline(owner):
+    """
+    인코더가 30초 구간을 처리하기 직전마다 호출되는 C 콜백을 한 번만 생성합니다.
+    owner에 중단이 요청되었으면 False를 반환하여 whisper가 남은 구간을 처리하지 않고 끝내도록 합니다.
+    (ggml의 abort_callback은 연산 노드마다 호출되어 GIL 경합이 크므로 구간 단위로 확인)
+    """
+    owner_ref = weakref.ref(owner)
+    
+    def dispatch(ctx, state, user_data):
+        whisper = owner_ref()
+        return whisper is None or not whisper._abort_event.is_set()
+    
+    return WHISPER_ENCODER_BEGIN_CALLBACK(dispatch)
+
 class WhisperDLL:
-    def __init__(self, dll_path=None, vulkan_support=True):
-        """Whisper DLL을 로드하고 필요한 함수를 설정합니다."""
+    def __init__(self, dll_path=None, vulkan_support=True, backend=None, gpu_device=0, flash_attn=None):
+        """
+        Whisper DLL을 로드하고 필요한 함수를 설정합니다.
+        
+        backend는 GPU_BACKENDS의 이름 또는 "cpu"이며, 로드된 ggml에 해당 백엔드와 장치가 등록되어 있으면 모델을 GPU에 올립니다.
+        지정하지 않으면 vulkan_support에 따라 "vulkan" 또는 "cpu"를 사용합니다.
+        gpu_device는 GPU 백엔드에서 사용할 장치 번호입니다.
+        flash_attn을 지정하지 않으면 실제로 사용하는 백엔드가 FLASH_ATTN_BACKENDS에 속할 때만 Flash Attention을 사용합니다.
+        """
         try:
+            if backend is None:
+                backend = "vulkan" if vulkan_support else "cpu"
+            if backend != "cpu" and backend not in GPU_BACKENDS:
+                raise Exception(f"지원하지 않는 백엔드입니다: {backend}")
+            
             # GGML 관련 DLL 파일들 목록
-            self.vulkan_support = vulkan_support
-            self.extra_dlls = []
+            self.backend = backend
+            self.gpu_device = gpu_device
+            self.flash_attn = flash_attn  # None이면 DLL 로드 후 실제 백엔드에 따라 결정
+            self.vulkan_support = False  # DLL 로드 후 Vulkan 백엔드를 실제로 사용하는지 확인하여 설정
+            self._dll_dir_cookie = None  # os.add_dll_directory로 추가한 DLL 검색 경로
             self.acceleration_mode = "CPU"  # 기본값
             self.ctx = None  # 모델 컨텍스트 초기화
-            self.current_callback = None  # 콜백 참조 저장 (가비지 컬렉션 방지)
+            self.quantization = None  # 마지막으로 검사·로드한 모델의 가중치 형식 (예: "F16", "Q5_1")
+            self.model_size = 0  # 로드한 모델 파일 크기 (바이트, 성능 기록용)
+            self.last_perf = None  # 마지막 transcribe 호출의 성능 기록 (_record_perf 참고)
+            self._user_callback = None  # 현재 변환 작업의 세그먼트 콜백 (Python 함수)
+            self._segment_trampoline = _make_segment_trampoline(self)  # DLL에 넘기는 고정 C 콜백
+            self._abort_event = threading.Event()  # 진행 중인 변환의 중단 요청 (request_abort)
+            self._encoder_begin_trampoline = _make_encoder_begin_trampoline(self)  # 중단 요청을 확인하는 고정 C 콜백
+            self._audio_buf = None  # float32가 아닌 입력을 변환할 때 재사용하는 버퍼
+            self._result_buf = bytearray()  # 현재 변환에서 실시간 업데이트로 이미 읽은 세그먼트 (형식화된 UTF-8)
+            self._result_count = 0  # _result_buf에 담긴 세그먼트 수
+            self._params_cache = {}  # 빔 크기별로 한 번만 구성하는 디코딩 파라미터
+            self._default_params_cache = {}  # 샘플링 전략별로 DLL에서 한 번만 가져오는 기본 파라미터
+            self._params_lock = threading.Lock()  # 캐시된 파라미터를 수정·사용하는 동안 보호
+            self._free_lock = threading.Lock()  # 모델 해제 중복 실행 방지
+            self._free_thread = None  # 백그라운드에서 whisper_free를 실행 중인 스레드
             
-            # 현재 디렉토리 경로
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            # Go up two levels to get to the app root directory
-            current_dir = os.path.dirname(os.path.dirname(current_dir))
+            # 앱 루트 디렉토리 (DLL 존재 여부는 디렉토리 수정 시각 기준으로 캐시된 결과를 사용)
+            current_dir = APP_ROOT
             
-            # whisper.dll 경로 설정
+            # whisper.dll 경로 설정 (다른 이름도 순서대로 시도)
             if dll_path is None:
-                dll_path = os.path.join(current_dir, "whisper.dll")
-                if not os.path.exists(dll_path):
-                    # 현재 디렉토리에서 whisper.dll을 찾지 못한 경우, 다른 이름 시도
-                    possible_names = ["whisper.dll", "whisper_cpp.dll", "whisper-cpp.dll", "whisperdll.dll"]
-                    found = False
-                    for name in possible_names:
-                        test_path = os.path.join(current_dir, name)
-                        if os.path.exists(test_path):
-                            dll_path = test_path
-                            found = True
-                            break
-                    
-                    if not found:
-                        raise Exception(f"whisper.dll 파일을 찾을 수 없습니다. '{current_dir}' 디렉토리에 파일이 있는지 확인하세요.")
-            
-            # 필요한 DLL 파일 목록
-            ggml_dlls = [
-                "ggml.dll",
-                "ggml-base.dll",
-                "ggml-cpu.dll",
-            ]
-            
-            # Vulkan 지원이 요청된 경우 목록에 추가
-            if vulkan_support:
-                ggml_dlls.append("ggml-vulkan.dll")
-            
-            # 모든 필요한 DLL 파일을 로드
-            for dll_name in ggml_dlls:
-                dll_path_full = os.path.join(current_dir, dll_name)
-                if os.path.exists(dll_path_full):
-                    try:
-                        ggml_dll = ctypes.CDLL(dll_path_full)
-                        self.extra_dlls.append(ggml_dll)
-                        
-                        # 가속 모드 설정
-                        if dll_name == "ggml-vulkan.dll" and vulkan_support:
-                            self.acceleration_mode = "Vulkan GPU"
-                    except Exception:
-                        pass
-            
-            # 메인 Whisper DLL 로드
-            self.dll = ctypes.CDLL(dll_path)
+                dll_path = find_dll_file(current_dir, WHISPER_DLL_NAMES)
+                if dll_path is None:
+                    raise Exception(f"whisper.dll 파일을 찾을 수 없습니다. '{current_dir}' 디렉토리에 파일이 있는지 확인하세요.")
+            self.dll_path = dll_path  # 로드한 whisper DLL 경로 (새 인스턴스를 만들 때 다시 찾지 않도록 재사용)
+            
+            # whisper.dll이 있는 디렉토리를 DLL 검색 경로에 추가하고 whisper.dll만 로드
+            # (ggml-*.dll은 Windows 로더가 의존 관계 순서대로 한 번씩만 로드)
+            dll_dir = os.path.dirname(os.path.abspath(dll_path))
+            if hasattr(os, 'add_dll_directory'):
+                self._dll_dir_cookie = os.add_dll_directory(dll_dir)
+            
+            # 기본 DLL과 선택한 GPU 백엔드의 DLL 존재 여부를 디렉토리 목록 한 번으로 확인
+            # (기본 DLL이 없으면 로더가 의존 DLL을 찾다 실패하므로 whisper.dll을 로드하기 전에 중단)
+            backend_dlls = [GPU_BACKENDS[backend][0]] if backend in GPU_BACKENDS else []
+            missing, _ = check_required_dlls(dll_dir, [*GGML_CORE_DLLS, *backend_dlls])
+            missing_core = [dll for dll in GGML_CORE_DLLS if dll in missing]
+            if missing_core:
+                raise Exception(f"필수 DLL 누락: {', '.join(missing_core)}")
+            
+            # 메인 Whisper DLL 로드 (의존 DLL을 찾지 못하면 로더 오류만으로는 원인을 알 수 없으므로 시스템 DLL을 확인해 안내)
+            try:
+                self.dll = ctypes.CDLL(dll_path)
+            except OSError as e:
+                missing_system = missing_system_dlls()
+                if missing_system:
+                    hint = "누락된 시스템 DLL: " + ", ".join(f"{dll} - {SYSTEM_DLLS[dll]}" for dll in missing_system)
+                else:
+                    hint = "whisper.dll과 ggml DLL이 같은 빌드인지 확인하세요"
+                raise Exception(f"{os.path.basename(dll_path)} 로드 실패: {str(e)} ({hint})")
+            
+            # 가속 모드 설정 (선택한 GPU 백엔드가 로드된 ggml에 실제로 등록되어 있고 장치가 있을 때만 GPU 사용)
+            if backend_dlls and backend_dlls[0] not in missing:
+                n_devices = ggml_device_count(dll_dir, backend)
+                if n_devices is None or n_devices > gpu_device:
+                    self.acceleration_mode = backend_label(backend)
+                else:
+                    log.warning("ggml에 %s 백엔드 장치 %d이(가) 없어 CPU로 실행합니다 (등록된 장치 %d개)",
+                                GPU_BACKENDS[backend][1], gpu_device, n_devices)
+            
+            # 실제로 사용하는 백엔드에 따라 Flash Attention 결정
+            active_backend = backend if self.acceleration_mode != "CPU" else "cpu"
+            if self.flash_attn is None:
+                self.flash_attn = active_backend in FLASH_ATTN_BACKENDS
+            self.vulkan_support = active_backend == "vulkan"
+            
+            # 스레드 수 (가속 모드에 따라 결정)
+            self.n_threads = default_n_threads(gpu=self.acceleration_mode != "CPU")
             
             # 콜백 타입 가져오기
             self.WHISPER_NEW_SEGMENT_CALLBACK = WHISPER_NEW_SEGMENT_CALLBACK
@@ -223,45 +490,79 @@ class WhisperDLL:
             # 함수 초기화
             if not self.initialize():
                 raise Exception("DLL 함수 초기화 실패")
+            self._cache_functions()
                 
         except Exception as e:
             raise Exception(f"WhisperDLL 초기화 실패: {str(e)}")
     
     def load_model(self, model_path):
         """Whisper 모델을 로드합니다."""
-        # 이미 모델이 로드되어 있는 경우 먼저 해제
+        # 이미 모델이 로드되어 있는 경우 먼저 해제하고, 해제가 끝나야 새 모델의 메모리를 확보할 수 있으므로 대기
         self.free_model()
+        self._wait_for_free()
         
         try:
             # 파일이 존재하는지 확인
             if not os.path.exists(model_path):
                 raise Exception(f"모델 파일이 존재하지 않습니다: {model_path}")
             
+            # 가중치 형식과 파일 크기 기록
+            self.quantization = read_model_ftype(model_path)
+            self.model_size = os.path.getsize(model_path)
+            
             # 파일 경로를 바이트로 인코딩
             model_path_bytes = model_path.encode('utf-8')
             
-            # 모델 로드 시도 (whisper_init_from_file 사용)
-            self.ctx = self.dll.whisper_init_from_file(model_path_bytes)
+            # 컨텍스트 파라미터 설정 (GPU 사용 여부, 장치 번호, Flash Attention)
+            context_params = self.dll.whisper_context_default_params()
+            context_params.use_gpu = self.acceleration_mode != "CPU"
+            context_params.gpu_device = self.gpu_device
+            context_params.flash_attn = self.flash_attn
+            
+            # 모델 로드 시도
+            self.ctx = self.dll.whisper_init_from_file_with_params(model_path_bytes, context_params)
             
             # 로드 실패 시
             if not self.ctx or self.ctx == 0:
-                raise Exception("모델 초기화 실패: whisper_init_from_file이 null을 반환했습니다")
+                raise Exception("모델 초기화 실패: whisper_init_from_file_with_params가 null을 반환했습니다")
             
             return True
         except Exception as e:
             self.free_model()  # 오류 발생 시 모델 해제
             raise Exception(f"모델 로드 실패: {str(e)}")
     
-    def free_model(self):
-        """모델을 메모리에서 해제합니다."""
-        if hasattr(self, 'ctx') and self.ctx:
+    def free_model(self, background=True):
+        """
+        모델을 메모리에서 해제합니다.
+        
+        GPU 백엔드의 whisper_free는 장치가 유휴 상태가 될 때까지 기다리므로 기본적으로 백그라운드 스레드에서 실행하고,
+        ctx는 즉시 비워 호출한 스레드(UI)를 막지 않습니다. background=False이면 바로 해제합니다.
+        """
+        free_lock = getattr(self, '_free_lock', None)
+        if free_lock is None:  # 초기화 도중 실패한 경우
+            return True
+        
+        with free_lock:
+            ctx, self.ctx = self.ctx, None
+            if not ctx:
+                return True
+            
             try:
-                self.dll.whisper_free(self.ctx)
-                self.ctx = None
+                if background:
+                    self._free_thread = threading.Thread(target=self.dll.whisper_free, args=(ctx,), daemon=True)
+                    self._free_thread.start()
+                else:
+                    self.dll.whisper_free(ctx)
                 return True
             except Exception:
                 return False
-        return True
+    
+    def _wait_for_free(self):
+        """진행 중인 백그라운드 모델 해제가 끝날 때까지 기다립니다."""
+        free_thread = self._free_thread
+        if free_thread is not None:
+            free_thread.join()
+            self._free_thread = None
             
     def check_model_validity(self, model_path):
         """모델 파일의 유효성만 검사합니다. 실제 로드는 하지 않습니다."""
@@ -275,160 +576,592 @@ class WhisperDLL:
             if file_size < 1024:  # 1KB 미만은 유효한 모델 파일이 아닐 가능성이 높음
                 raise Exception(f"모델 파일이 너무 작습니다 ({file_size} bytes). 손상된 파일일 수 있습니다.")
             
+            # 가중치 형식 확인 (양자화 모델은 F16보다 메모리 대역폭을 적게 사용)
+            self.quantization = read_model_ftype(model_path)
+            
             return True
         except Exception as e:
             raise Exception(f"모델 파일 검사 실패: {str(e)}")
     
-    def transcribe(self, audio_data, language=None, new_segment_callback=None):
-        """오디오 데이터를 텍스트로 변환합니다."""
+    def _default_params(self, strategy):
+        """
+        샘플링 전략에 맞는 기본 파라미터의 사본을 반환합니다.
+        DLL에서는 전략별로 처음 한 번만 가져오고, 이후에는 보관한 값을 복사합니다.
+        """
+        defaults = self._default_params_cache.get(strategy)
+        if defaults is None:
+            params_ptr = self.dll.whisper_full_default_params_by_ref(strategy)
+            if not params_ptr:
+                raise Exception("whisper_full_default_params_by_ref가 NULL을 반환했습니다")
+            
+            try:
+                defaults = WhisperFullParams.from_buffer_copy(params_ptr.contents)
+            finally:
+                self.dll.whisper_free_params(params_ptr)
+            
+            # 구조체 정의가 DLL의 whisper_full_params와 일치하는지 알려진 기본값으로 확인
+            mismatched = [name for name, value in (("strategy", strategy), *WHISPER_PARAMS_LAYOUT_CHECK)
+                          if getattr(defaults, name) != value]
+            if mismatched:
+                raise Exception(f"WhisperFullParams 구조가 DLL과 일치하지 않습니다: {', '.join(mismatched)} (whisper.h 버전 확인 필요)")
+            self._default_params_cache[strategy] = defaults
+        
+        return WhisperFullParams.from_buffer_copy(defaults)
+    
+    def _as_float32(self, audio_data):
+        """
+        DLL에 넘길 연속된 float32 배열을 반환합니다.
+        이미 연속된 float32 배열이면 복사 없이 그대로 사용하고,
+        아니면 재사용 버퍼(필요할 때만 확장)에 변환하여 기록합니다.
+        """
+        if audio_data.dtype == np.float32 and audio_data.flags.c_contiguous:
+            return audio_data
+        
+        audio_float = self._audio_buffer(len(audio_data))
+        np.copyto(audio_float, audio_data, casting='unsafe')
+        return audio_float
+    
+    def _audio_buffer(self, n):
+        """
+        재사용 float32 버퍼의 앞쪽 n개 구간을 반환합니다.
+        부족할 때는 1.5배씩 키워, 길이가 조금씩 늘어나는 입력에서 매번 새로 할당하지 않도록 합니다.
+        """
+        size = 0 if self._audio_buf is None else self._audio_buf.size
+        if size < n:
+            self._audio_buf = np.empty(max(n, size + size // 2), dtype=np.float32)
+        return self._audio_buf[:n]
+    
+    def _cached_params(self, beam_size):
+        """빔 크기별 디코딩 파라미터를 처음 한 번만 구성하고 이후에는 재사용합니다."""
+        params = self._params_cache.get(beam_size)
+        if params is None:
+            params = self._build_params(beam_size)
+            self._params_cache[beam_size] = params
+        return params
+    
+    @staticmethod
+    def _set_language(params, language):
+        """호출마다 달라지는 언어 설정을 적용합니다."""
+        if language:
+            params.language = language.encode('utf-8')
+            params.detect_language = False
+        else:
+            params.language = None
+            params.detect_language = True
+    
+    def _prepare_audio(self, audio_data, sample_rate=WHISPER_SAMPLE_RATE, normalize=False):
+        """
+        DLL 호출 전 오디오 전처리: 모노 변환, 16kHz 리샘플링, float32 변환(+선택적 최대 진폭 정규화).
+        정규화 시 변환과 정규화는 재사용 버퍼 위에서 JIT 커널로 한 번에 처리합니다.
+        int16 PCM은 -1.0 ~ 1.0 범위로 변환하며, 다운믹스와 함께 JIT 커널로 한 번에 처리합니다.
+        """
+        if audio_data.dtype == np.int16:
+            channels = audio_data.shape[1] if audio_data.ndim > 1 else 1
+            pcm = np.ascontiguousarray(audio_data).reshape(-1)
+            audio_data = pcm16_to_f32_mono(pcm, channels, self._audio_buffer(len(audio_data)))
+        if audio_data.ndim > 1:
+            audio_data = audio_data.mean(axis=1, dtype=np.float32)
+        if sample_rate != WHISPER_SAMPLE_RATE:
+            audio_data = resample(audio_data, sample_rate, WHISPER_SAMPLE_RATE)
+        if not normalize:
+            return self._as_float32(audio_data)
+        
+        return to_float32_normalize(audio_data, self._audio_buffer(len(audio_data)))
+    
+    def _build_params(self, beam_size=5):
+        """빔 크기에 맞게 호출마다 바뀌지 않는 디코딩 파라미터를 구성합니다."""
+        # 샘플링 전략 결정 (빔이 2개 이상이면 빔 탐색)
+        if beam_size > 1:
+            strategy = WhisperSamplingStrategy.WHISPER_SAMPLING_BEAM_SEARCH
+        else:
+            strategy = WhisperSamplingStrategy.WHISPER_SAMPLING_GREEDY
+        
+        # 기본 파라미터 가져오기
+        params = self._default_params(strategy)
+        
+        # 최적의 매개변수 설정
+        params.n_threads = self.n_threads   # 스레드 수
+        params.audio_ctx = 0                # 오디오 컨텍스트 크기 (0: 전체)
+        params.max_len = 0                  # 최대 세그먼트 길이 (0: 제한 없음)
+        params.greedy.best_of = 1           # 후보 샘플링 수 (그리디 폴백 시)
+        params.beam_search.beam_size = max(1, beam_size)  # 빔 크기 (빔들은 한 번의 배치 디코딩으로 처리)
+        params.beam_search.patience = 1.0   # 빔 탐색 패티언스
+        
+        # 탐지 임계값 매개변수 조정
+        params.no_speech_thold = 0.6        # 무음 임계값 (기본값 0.6에서 낮춤)
+        params.entropy_thold = 2.0          # 엔트로피 임계값
+        params.logprob_thold = -1.0         # 로그 확률 임계값
+        
+        # 온도 설정
+        params.temperature = 0.0            # 초기 온도 (0: 그리디)
+        params.temperature_inc = 0.2        # 온도 증분 (폴백 횟수를 줄여 재디코딩 비용 절감)
+        
+        # 토큰 타임스탬프 임계값
+        params.thold_pt = 0.01              # 토큰 타임스탬프 확률 임계값
+        
+        # 인쇄 옵션 (DLL 내부의 stderr 출력은 디코딩 루프를 느리게 하므로 기본적으로 끔, transcribe의 verbose로 켬)
+        params.print_progress = False       # 진행 상황 출력
+        params.print_realtime = False       # 실시간 결과 출력
+        params.print_timestamps = False     # 타임스탬프 출력
+        
+        params.suppress_blank = True
+        
+        # 인코딩 구간마다 중단 요청 확인
+        params.encoder_begin_callback = self._encoder_begin_trampoline
+        params.encoder_begin_callback_user_data = None
+        
+        # 비음성 토큰 억제
+        params.suppress_nst = True
+        
+        # 화자 전환 감지 활성화
+        params.tdrz_enable = True
+        
+        return params
+    
+    def transcribe(self, audio_data, language=None, new_segment_callback=None, beam_size=5,
+                   sample_rate=WHISPER_SAMPLE_RATE, normalize=False, trim_silence=True, verbose=False,
+                   n_processors=1):
+        """
+        오디오 데이터를 텍스트로 변환합니다.
+        
+        new_segment_callback은 (ctx, state, n_new, user_data)를 받는 일반 Python 함수이며,
+        디코더 스레드에서 디코딩을 멈춘 채 호출되므로 짧게 끝나야 합니다.
+        beam_size가 1보다 크면 빔 탐색(배치 디코딩)을, 1이면 그리디 디코딩을 사용합니다.
+        CPU 전용 환경에서는 beam_size=1이 짧은 음성에서 훨씬 빠릅니다.
+        sample_rate가 16kHz가 아니면 리샘플링하고, normalize=True이면 최대 진폭을 1.0으로 맞춥니다.
+        trim_silence=True이면 끝부분의 무음을 잘라낸 뒤 변환합니다.
+        audio_data가 이미 연속된 16kHz 모노 float32 배열이면 복사 없이 그대로 DLL에 전달되므로,
+        호출하는 쪽에서 가능하면 그 형식으로 준비하는 것이 좋습니다.
+        verbose=True이면 DLL이 진행 상황과 결과를 콘솔(stderr)에 출력합니다.
+        n_processors가 2 이상이면 whisper_full_parallel로 오디오를 같은 길이로 나누어 동시에 변환하고,
+        None이면 CPU 모드에서 60초보다 긴 오디오만 스레드 수에 맞춰 자동으로 나눕니다.
+        (조각 경계 부근의 정확도가 떨어질 수 있고 실시간 콜백은 첫 조각에서만 호출되므로,
+        new_segment_callback으로 진행 상황을 표시하는 경우에는 기본값 1을 사용)
+        """
         if not self.ctx:
             raise Exception("모델이 로드되지 않았습니다")
         
         try:
-            # 오디오 데이터를 float32 배열로 변환
-            audio_float = audio_data.astype(np.float32)
+            # 오디오 전처리 후 float32 배열로 변환 (이미 16kHz float32면 복사하지 않음)
+            audio_float = self._prepare_audio(audio_data, sample_rate, normalize)
             
-            # 배열을 C 포인터로 변환
-            audio_ptr = audio_float.ctypes.data_as(ctypes.POINTER(ctypes.c_float))
+            # 끝부분 무음 제거 (인코딩할 길이를 줄이고 무음 구간의 환각 출력 방지)
+            if trim_silence:
+                audio_float = _trim_trailing_silence(audio_float)
             
-            # 기본 파라미터 가져오기
-            params = WhisperFullParams()
+            # 배열의 데이터 주소 (정수로 바로 전달하여 포인터 객체 생성 생략)
+            # 주소만 넘기므로 DLL이 잘못된 메모리를 읽지 않도록 형식을 확인
+            if audio_float.dtype != np.float32 or not audio_float.flags.c_contiguous:
+                raise Exception("오디오 버퍼는 연속된 float32 배열이어야 합니다")
+            audio_ptr = audio_float.ctypes.data
             
-            try:
-                # 전략 매개변수가 있는 버전 시도
-                try:
-                    self.dll.whisper_full_default_params_by_ref(ctypes.byref(params), WhisperSamplingStrategy.WHISPER_SAMPLING_GREEDY)
-                except Exception:
-                    # 매개변수 없는 버전 시도
-                    self.dll.whisper_full_default_params_by_ref(ctypes.byref(params))
-            except Exception:
-                # 다른 방법 시도: 포인터 기반 방식
-                params_ptr = self.dll.whisper_full_default_params()
-                if not params_ptr:
-                    raise Exception("whisper_full_default_params가 NULL을 반환했습니다")
-                return self._transcribe_with_ptr(audio_float, audio_ptr, params_ptr, language)
-            
-            # 최적의 매개변수 설정
-            params.n_threads = 4                # 스레드 수
-            params.audio_ctx = 0                # 오디오 컨텍스트 크기 (0: 전체)
-            params.max_len = 0                  # 최대 세그먼트 길이 (0: 제한 없음)
-            params.greedy.best_of = 5           # 후보 샘플링 수
-            params.beam_search.beam_size = 5    # 빔 크기
-            
-            # 탐지 임계값 매개변수 조정
-            params.no_speech_thold = 0.6        # 무음 임계값 (기본값 0.6에서 낮춤)
-            params.entropy_thold = 2.0          # 엔트로피 임계값
-            params.logprob_thold = -1.0         # 로그 확률 임계값
-            
-            # 온도 설정
-            params.temperature = 0.0            # 초기 온도 (0: 그리디)
-            params.temperature_inc = 0.2        # 온도 증분 (기본값 0.2에서 높임)
-            
-            # 토큰 타임스탬프 임계값
-            params.thold_pt = 0.01              # 토큰 타임스탬프 확률 임계값
-            
-            # 인쇄 옵션
-            params.print_progress = True        # 진행 상황 출력
-            params.print_realtime = True        # 실시간 결과 출력 활성화
-            params.print_timestamps = True      # 타임스탬프 출력
-            
-            # 언어 지정이 있는 경우 설정
-            if language:
-                params.language = language.encode('utf-8')
-                params.detect_language = False
-            else:
-                params.detect_language = True
-            
-            params.suppress_blank = True
-            
-            # 비음성 토큰 억제
-            params.suppress_nst = True
-            
-            # 화자 전환 감지 활성화
-            params.tdrz_enable = True
-            
-            # 콜백 설정 (있는 경우)
-            if new_segment_callback:
-                self.current_callback = new_segment_callback
-                params.new_segment_callback = new_segment_callback
+            with self._params_lock:
+                # 캐시된 파라미터에 호출마다 바뀌는 값(언어, 출력 옵션, 콜백)만 설정
+                params = self._cached_params(beam_size)
+                self._set_language(params, language)
+                params.print_progress = params.print_realtime = params.print_timestamps = verbose
+                
+                # 콜백 설정 - 고정 트램펄린이 사용자 콜백으로 전달 (없으면 NULL)
+                self._user_callback = new_segment_callback
+                if new_segment_callback:
+                    params.new_segment_callback = self._segment_trampoline
+                else:
+                    params.new_segment_callback = NULL_SEGMENT_CALLBACK
                 params.new_segment_callback_user_data = None
-            
-            # 변환 실행
-            try:
-                result = self.dll.whisper_full(self.ctx, ctypes.byref(params), audio_ptr, len(audio_float))
-            except Exception as e:
-                raise Exception(f"whisper_full 호출 중 예외 발생: {str(e)}")
+                
+                # 실시간 업데이트로 모으는 결과 초기화
+                self._result_buf = bytearray()
+                self._result_count = 0
+                
+                # 분할 수 결정 (GPU 백엔드에서는 분할해도 빨라지지 않으므로 CPU 모드에서만 자동 분할)
+                if n_processors is None:
+                    n_processors = 1
+                    if self.acceleration_mode == "CPU" and len(audio_float) > PARALLEL_MIN_SAMPLES:
+                        n_processors = max(1, self.n_threads // PARALLEL_MIN_THREADS)
+                
+                # 변환 실행 (DLL 호출 시간 측정)
+                t0 = time.perf_counter_ns()
+                try:
+                    if n_processors > 1:
+                        # 전체 스레드 수가 늘지 않도록 조각마다 스레드를 나누어 배정
+                        params.n_threads = max(1, self.n_threads // n_processors)
+                        result = self._f_full_parallel(self.ctx, ctypes.byref(params), audio_ptr, len(audio_float), n_processors)
+                    else:
+                        result = self._f_full(self.ctx, ctypes.byref(params), audio_ptr, len(audio_float))
+                except Exception as e:
+                    raise Exception(f"whisper_full 호출 중 예외 발생: {str(e)}")
+                finally:
+                    full_ns = time.perf_counter_ns() - t0
+                    self._user_callback = None
+                    self._abort_event.clear()
+                    params.n_threads = self.n_threads
             
             if result != 0:
                 raise Exception(f"오디오 변환 실패: 코드 {result}")
             
             # 결과 텍스트 가져오기 (세그먼트 조합)
-            return self._get_transcription_result()
+            t0 = time.perf_counter_ns()
+            text = self._get_transcription_result()
+            self._record_perf(len(audio_float), full_ns, time.perf_counter_ns() - t0, n_processors)
+            return text
             
         except Exception as e:
             raise Exception(f"변환 오류: {str(e)}")
+
+    def request_abort(self):
+        """
+        진행 중인 변환을 중단하도록 요청합니다. (다른 스레드에서 호출 가능)
+        whisper는 다음 30초 구간의 인코딩을 시작하기 전에 멈추고, 그때까지의 결과만 반환합니다.
+        요청은 다음 transcribe 호출이 끝나거나 reset_abort를 호출하면 해제됩니다.
+        """
+        self._abort_event.set()
+    
+    def reset_abort(self):
+        """처리되지 않은 중단 요청을 해제합니다."""
+        self._abort_event.clear()
+    
+    def _record_perf(self, n_samples, full_ns, collect_ns, n_processors=1):
+        """
+        transcribe 한 번의 성능 기록을 last_perf에 저장하고 DEBUG 로그로 남깁니다.
+        
+        처리한 샘플/초와 함께 읽은 바이트/초(모델 가중치 + float32 오디오)를 기록하여,
+        변환 시간이 연산량(샘플 수)과 메모리 이동량(모델 크기) 중 어느 쪽을 따라가는지
+        양자화·Flash Attention·스레드 수를 바꿔 가며 비교할 수 있도록 합니다.
+        (GPU 백엔드에서는 가중치가 VRAM에 있으므로 바이트/초는 참고용)
+        
+        Args:
+            n_samples (int): DLL에 넘긴 16kHz 샘플 수
+            full_ns (int): whisper_full(_parallel) 호출 시간 (ns)
+            collect_ns (int): 세그먼트 결과를 모으는 데 걸린 시간 (ns)
+            n_processors (int): whisper_full_parallel 분할 수
+        """
+        full_s = max(full_ns, 1) / 1e9
+        bytes_moved = self.model_size + 4 * n_samples
+        self.last_perf = {
+            "backend": self.acceleration_mode,
+            "quantization": self.quantization,
+            "n_threads": self.n_threads,
+            "n_processors": n_processors,
+            "n_samples": n_samples,
+            "full_s": full_s,
+            "collect_s": collect_ns / 1e9,
+            "samples_per_s": n_samples / full_s,
+            "realtime_factor": n_samples / WHISPER_SAMPLE_RATE / full_s,
+            "bytes_per_s": bytes_moved / full_s,
+        }
+        
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("whisper_full %.3fs (%s, %s, 스레드 %d, 분할 %d): %.0f 샘플/s (x%.1f 실시간), %.1f MB/s, 결과 수집 %.1fms",
+                      full_s, self.acceleration_mode, self.quantization, self.n_threads, n_processors,
+                      self.last_perf["samples_per_s"], self.last_perf["realtime_factor"],
+                      self.last_perf["bytes_per_s"] / 1e6, collect_ns / 1e6)
+    
+    def make_fixed_transcriber(self, n_samples, language=None, beam_size=5):
+        """
+        길이가 항상 n_samples인 16kHz 모노 오디오 전용 변환 함수를 만들어 반환합니다.
+
+        버퍼, 데이터 주소, 파라미터, DLL 함수를 미리 준비해 두므로 반환된 함수는
+        전처리·형식 검사·파라미터 설정 없이 복사 한 번과 whisper_full 호출만 수행합니다.
+        (스트리밍처럼 같은 길이의 청크를 반복해서 변환할 때 사용, 콜백·무음 제거는 지원하지 않음)
+        모델을 다시 로드하면 새로 만들어야 합니다.
+        """
+        if not self.ctx:
+            raise Exception("모델이 로드되지 않았습니다")
+        if n_samples <= 0:
+            raise Exception(f"잘못된 샘플 수: {n_samples}")
+
+        # 전용 버퍼와 파라미터 사본 (transcribe의 재사용 버퍼·캐시와 공유하지 않음)
+        buf = np.zeros(n_samples, dtype=np.float32)
+        with self._params_lock:
+            params = WhisperFullParams.from_buffer_copy(self._cached_params(beam_size))
+        self._set_language(params, language)
+        params.new_segment_callback = NULL_SEGMENT_CALLBACK
+        params.new_segment_callback_user_data = None
+
+        full, ctx, lock = self._f_full, self.ctx, self._params_lock
+        params_ref, audio_ptr = ctypes.byref(params), buf.ctypes.data
+        copyto = np.copyto
+
+        def fast_transcribe(audio):
+            # 해제된 컨텍스트를 넘기면 프로세스가 종료되므로 모델이 바뀌었는지만 확인
+            if self.ctx is not ctx:
+                raise Exception("모델이 변경되었습니다. make_fixed_transcriber를 다시 호출하세요")
+
+            copyto(buf, audio, casting='unsafe')
+            with lock:
+                result = full(ctx, params_ref, audio_ptr, n_samples)
+                if result != 0:
+                    raise Exception(f"오디오 변환 실패: 코드 {result}")
+
+                self._result_buf = bytearray()
+                self._result_count = 0
+                return self._get_transcription_result()
+
+        # 버퍼와 파라미터가 함수보다 먼저 해제되지 않도록 함수에 묶어 둠
+        fast_transcribe.buffer = buf
+        fast_transcribe.params = params
+        return fast_transcribe
+
+    def transcribe_stream(self, audio_data, language=None, window_sec=WHISPER_CHUNK_SIZE, beam_size=5, n_states=2):
+        """
+        긴 오디오를 window_sec 길이의 창으로 나누어 변환합니다.
+        
+        모델 가중치를 공유하는 whisper_state를 n_states개 만들고 각각 작업 스레드에서 실행하여,
+        한 창을 디코딩하는 동안 다음 창의 인코딩이 동시에 진행되도록 합니다.
+        (DLL 호출 중에는 GIL이 해제되므로 스레드가 실제로 병렬 실행됨)
+        각 창은 이전 창의 텍스트 문맥 없이 독립적으로 디코딩됩니다.
+        """
+        if not self.ctx:
+            raise Exception("모델이 로드되지 않았습니다")
+        
+        audio_float = _trim_trailing_silence(self._as_float32(audio_data))
+        window = int(window_sec * WHISPER_SAMPLE_RATE)
+        with self._params_lock:
+            params = WhisperFullParams.from_buffer_copy(self._cached_params(beam_size))
+        params.new_segment_callback = NULL_SEGMENT_CALLBACK
+        self._set_language(params, language)
+        
+        # 처리할 창 목록 (오디오 조각, 10ms 단위 시간 오프셋)
+        chunks = [(audio_float[start:start + window], start * 100 // WHISPER_SAMPLE_RATE)
+                  for start in range(0, len(audio_float), window)]
+        results = self._run_with_states(chunks, params, n_states)
+        
+        return "".join(results).strip()
     
-    def _transcribe_with_ptr(self, audio_float, audio_ptr, params_ptr, language=None):
-        """포인터 기반 방식으로 변환 (whisper_full_default_params_by_ref가 실패할 경우)"""
+    def transcribe_chunks(self, chunks, language=None, beam_size=5, sample_rate=WHISPER_SAMPLE_RATE):
+        """
+        오디오 조각을 순서대로 받아 조각별 결과 텍스트를 내놓는 제너레이터입니다.
+        
+        준비 스레드가 다음 조각을 모노 float32로 변환·리샘플링하는 동안 현재 조각의 변환이 진행되어,
+        전처리 시간이 변환 시간 뒤에 가려집니다. 각 조각은 별도의 whisper_state에서 변환되며,
+        시간은 앞 조각들의 길이만큼 이어서 표시됩니다.
+        """
+        if not self.ctx:
+            raise Exception("모델이 로드되지 않았습니다")
+        
+        with self._params_lock:
+            params = WhisperFullParams.from_buffer_copy(self._cached_params(beam_size))
+        params.new_segment_callback = NULL_SEGMENT_CALLBACK
+        self._set_language(params, language)
+        
+        # 준비된 조각 (최대 2개까지 미리 준비, None은 끝, 예외는 준비 실패)
+        prepared = queue.Queue(maxsize=2)
+        stop = threading.Event()
+        
+        def put(item):
+            # 소비 쪽이 중단되면 더 기다리지 않음
+            while not stop.is_set():
+                try:
+                    prepared.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        
+        def producer():
+            try:
+                for chunk in chunks:
+                    if chunk.ndim > 1:
+                        chunk = chunk.mean(axis=1, dtype=np.float32)
+                    chunk = resample(chunk, sample_rate, WHISPER_SAMPLE_RATE)
+                    if not put(np.ascontiguousarray(chunk, dtype=np.float32)):
+                        return
+            except Exception as e:
+                put(e)
+                return
+            put(None)
+        
+        state = self.dll.whisper_init_state(self.ctx)
+        if not state:
+            raise Exception("whisper_init_state가 NULL을 반환했습니다")
+        
+        threading.Thread(target=producer, daemon=True).start()
+        n_samples = 0  # 지금까지 변환한 샘플 수 (시간 오프셋 계산용)
         try:
-            # 변환 실행
-            result = self.dll.whisper_full(self.ctx, params_ptr, audio_ptr, len(audio_float))
-            
-            if result != 0:
-                raise Exception(f"오디오 변환 실패: 코드 {result}")
+            while True:
+                chunk = prepared.get()
+                if chunk is None:
+                    return
+                if isinstance(chunk, Exception):
+                    raise Exception(f"오디오 준비 실패: {chunk}")
+                
+                result = self._f_full_state(self.ctx, state, ctypes.byref(params), chunk.ctypes.data, len(chunk))
+                if result != 0:
+                    raise Exception(f"오디오 변환 실패: 코드 {result}")
+                
+                t_offset = n_samples * 100 // WHISPER_SAMPLE_RATE
+                n_samples += len(chunk)
+                yield self._format_segments(0, self._f_n_seg_state(state), state, t_offset).strip()
+        finally:
+            stop.set()
+            self.dll.whisper_free_state(state)
+    
+    def transcribe_many(self, audios, language=None, beam_size=5):
+        """
+        여러 오디오를 한 번에 변환하여 파일별 결과 텍스트 목록을 반환합니다.
+        
+        파일마다 transcribe()를 순서대로 호출하는 대신, 모델 가중치를 공유하는 whisper_state를
+        여러 개 만들어 파일들을 동시에 처리합니다. 동시 처리 수는 CPU 코어 수를 스레드 수로 나눈 값입니다.
+        짧은 음성 여러 개를 처리할 때도 각 파일을 독립된 상태에서 디코딩하므로 결과가 섞이지 않습니다.
+        """
+        if not self.ctx:
+            raise Exception("모델이 로드되지 않았습니다")
+        if not audios:
+            return []
+        
+        with self._params_lock:
+            params = WhisperFullParams.from_buffer_copy(self._cached_params(beam_size))
+        params.new_segment_callback = NULL_SEGMENT_CALLBACK
+        self._set_language(params, language)
+        
+        # 재사용 버퍼(_audio_buf)는 하나뿐이므로 파일마다 별도의 float32 배열을 사용
+        chunks = [(_trim_trailing_silence(np.ascontiguousarray(audio, dtype=np.float32)), 0) for audio in audios]
+        n_processors = min(len(chunks), max(1, (os.cpu_count() or 1) // self.n_threads))
+        return [text.strip() for text in self._run_with_states(chunks, params, n_processors)]
+    
+    def _run_with_states(self, chunks, params, n_states):
+        """
+        (오디오, 시간 오프셋) 목록을 n_states개의 whisper_state로 나누어 병렬 변환하고,
+        입력 순서대로 결과 텍스트 목록을 반환합니다.
+        (DLL 호출 중에는 GIL이 해제되므로 스레드가 실제로 병렬 실행됨)
+        """
+        # 긴 오디오부터 처리하여 마지막에 긴 작업 하나만 남아 다른 상태가 노는 시간을 줄임
+        jobs = queue.Queue()
+        for index in sorted(range(len(chunks)), key=lambda i: len(chunks[i][0]), reverse=True):
+            jobs.put((index, chunks[index]))
+        
+        results = [""] * len(chunks)
+        errors = []
+        
+        def worker():
+            state = self.dll.whisper_init_state(self.ctx)
+            if not state:
+                errors.append("whisper_init_state가 NULL을 반환했습니다")
+                return
             
-            # 결과 텍스트 가져오기
-            return self._get_transcription_result()
+            # 스레드별 파라미터 사본 (문자열 포인터는 원본 params가 유지)
+            local_params = WhisperFullParams.from_buffer_copy(params)
             
-        except Exception as e:
-            raise Exception(f"변환 오류: {str(e)}")
+            # 반복문에서 쓰는 함수와 인자를 지역 변수로 한 번만 준비
+            ctx = self.ctx
+            params_ref = ctypes.byref(local_params)
+            full_with_state = self._f_full_state
+            n_seg = self._f_n_seg_state
+            get_job = jobs.get_nowait
+            try:
+                while not errors:
+                    try:
+                        index, (chunk, t_offset) = get_job()
+                    except queue.Empty:
+                        return
+                    
+                    result = full_with_state(ctx, state, params_ref, chunk.ctypes.data, len(chunk))
+                    if result != 0:
+                        errors.append(f"오디오 변환 실패: 코드 {result}")
+                        return
+                    
+                    n_segments = n_seg(state)
+                    results[index] = self._format_segments(0, n_segments, state, t_offset)
+            finally:
+                self.dll.whisper_free_state(state)
+        
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, min(n_states, len(chunks))))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        if errors:
+            raise Exception(f"변환 오류: {errors[0]}")
+        
+        return results
     
     def _get_transcription_result(self):
-        """변환 결과 텍스트를 가져옵니다."""
-        text = ""
-        n_segments = self.dll.whisper_full_n_segments(self.ctx)
+        """
+        변환 결과 텍스트를 가져옵니다.
+        실시간 업데이트(get_new_segments)로 이미 읽은 세그먼트는 DLL에서 다시 읽지 않고 나머지만 읽어 붙입니다.
+        """
+        n_segments = self._f_n_seg(self.ctx)
+        if self._result_count > n_segments:  # 이전 변환의 결과가 남아 있는 경우
+            self._result_buf = bytearray()
+            self._result_count = 0
         
-        for i in range(n_segments):
-            segment_text = self.dll.whisper_full_get_segment_text(self.ctx, i)
-            
-            # 세그먼트의 시작 및 종료 시간 가져오기
-            t0 = self.dll.whisper_full_get_segment_t0(self.ctx, i)
-            t1 = self.dll.whisper_full_get_segment_t1(self.ctx, i)
-            
-            # whisper에서는 시간 값이 10ms 단위로 반환됨
-            # 밀리초를 초로 변환 (10ms 단위의 값을 초 단위로)
-            t0_sec = t0 // 100
-            t1_sec = t1 // 100
-            
-            # 시, 분, 초 계산
-            t0_hour = t0_sec // 3600
-            t0_min = (t0_sec % 3600) // 60
-            t0_sec = t0_sec % 60
-            
-            t1_hour = t1_sec // 3600
-            t1_min = (t1_sec % 3600) // 60
-            t1_sec = t1_sec % 60
-            
-            # 시간 형식 문자열 생성
-            time_str = f"{t0_hour:02d}:{t0_min:02d}:{t0_sec:02d} -> {t1_hour:02d}:{t1_min:02d}:{t1_sec:02d}"
-            
+        buf = self._result_buf + self._format_segment_bytes(self._result_count, n_segments)
+        return buf.decode('utf-8', errors='replace').strip()
+    
+    def _format_segments(self, start, end, state=None, t_offset=0):
+        """
+        start부터 end 직전까지의 세그먼트를 "시작 -> 끝 텍스트" 형식의 줄로 만듭니다.
+        state가 주어지면 해당 whisper_state의 결과를 읽고, 시간에 t_offset(10ms 단위)을 더합니다.
+        """
+        return self._format_segment_bytes(start, end, state, t_offset).decode('utf-8', errors='replace')
+    
+    def _format_segment_bytes(self, start, end, state=None, t_offset=0):
+        """_format_segments와 같은 형식의 줄을 디코딩하기 전의 UTF-8 바이트열(bytearray)로 만듭니다."""
+        if state is None:
+            handle = self.ctx
+            get_text, get_t0, get_t1 = self._f_text, self._f_t0, self._f_t1
+        else:
+            handle = state
+            get_text, get_t0, get_t1 = self._f_text_state, self._f_t0_state, self._f_t1_state
+        
+        # 세그먼트 텍스트와 시작/종료 시간을 한 번에 수집
+        # (map이 ctypes 함수를 C 수준에서 반복 호출하므로 세그먼트마다 파이썬 바이트코드를 실행하지 않음)
+        indices = range(start, max(start, end))
+        texts = list(map(get_text, repeat(handle), indices))
+        times = np.array((list(map(get_t0, repeat(handle), indices)),
+                          list(map(get_t1, repeat(handle), indices))), dtype=np.int64).reshape(2, len(indices))
+        
+        # whisper에서는 시간 값이 10ms 단위로 반환됨 - 초 단위로 바꾼 뒤 시, 분, 초를 벡터 연산으로 계산
+        seconds = (times + t_offset) // 100
+        hours = (seconds // 3600).tolist()
+        minutes = (seconds % 3600 // 60).tolist()
+        seconds = (seconds % 60).tolist()
+        
+        # 시간 형식 문자열과 원본 UTF-8 바이트를 모음 (디코딩은 호출한 쪽에서 한 번만)
+        buf = bytearray()
+        for segment_text, h0, m0, s0, h1, m1, s1 in zip(texts, hours[0], minutes[0], seconds[0],
+                                                       hours[1], minutes[1], seconds[1]):
             if segment_text:
-                decoded_text = segment_text.decode('utf-8', errors='replace')
-                text += f"{time_str} {decoded_text}\n"
+                buf += _SEGMENT_TIME_FMT % (h0, m0, s0, h1, m1, s1)
+                buf += segment_text
+                buf += b"\n"
         
-        return text.strip()
+        return buf
     
     def get_current_segments(self):
-        """현재까지 인식된 모든 세그먼트를 가져옵니다. (실시간 업데이트용)"""
+        """현재까지 인식된 모든 세그먼트를 가져옵니다."""
         if not self.ctx:
             return ""
         
         return self._get_transcription_result()
     
+    def get_new_segments(self, n_new):
+        """마지막으로 추가된 n_new개의 세그먼트만 가져옵니다. (실시간 업데이트용)"""
+        if not self.ctx:
+            return ""
+        
+        n_segments = self._f_n_seg(self.ctx)
+        start = max(0, n_segments - n_new)
+        buf = self._format_segment_bytes(start, n_segments)
+        
+        # 앞선 결과에 바로 이어지는 구간이면 최종 결과용으로 보관 (변환 후 다시 읽지 않도록)
+        if start == self._result_count:
+            self._result_buf += buf
+            self._result_count = n_segments
+        
+        return buf.decode('utf-8', errors='replace').rstrip("\n")
+    
     def __del__(self):
         """객체 소멸 시 리소스 해제"""
         try:
-            self.free_model()
+            # 인터프리터 종료 중에는 새 스레드가 시작되지 않아 start()가 멈추므로 바로 해제
+            self.free_model(background=False)
+            
+            # DLL 검색 경로 제거
+            dll_dir_cookie = getattr(self, '_dll_dir_cookie', None)
+            if dll_dir_cookie is not None:
+                dll_dir_cookie.close()
         except Exception:
             pass
             
@@ -437,29 +1170,31 @@ class WhisperDLL:
         try:
             # Whisper DLL 함수 설정
             # 초기화 및 해제 함수
-            self.dll.whisper_init_from_file.argtypes = [ctypes.c_char_p]
-            self.dll.whisper_init_from_file.restype = ctypes.c_void_p
+            self.dll.whisper_context_default_params.argtypes = []
+            self.dll.whisper_context_default_params.restype = WhisperContextParams
+            
+            self.dll.whisper_init_from_file_with_params.argtypes = [ctypes.c_char_p, WhisperContextParams]
+            self.dll.whisper_init_from_file_with_params.restype = ctypes.c_void_p
             
             self.dll.whisper_free.argtypes = [ctypes.c_void_p]
             self.dll.whisper_free.restype = None
             
-            # 파라미터 관련 함수 - 두 가지 버전 모두 정의
-            try:
-                self.dll.whisper_full_default_params_by_ref.argtypes = [ctypes.POINTER(WhisperFullParams), ctypes.c_int]
-                self.dll.whisper_full_default_params_by_ref.restype = None
-            except Exception:
-                # 매개변수 없는 버전 시도
-                self.dll.whisper_full_default_params_by_ref.argtypes = [ctypes.POINTER(WhisperFullParams)]
-                self.dll.whisper_full_default_params_by_ref.restype = None
+            # 파라미터 관련 함수
+            # whisper_full_params* whisper_full_default_params_by_ref(enum whisper_sampling_strategy strategy)
+            self.dll.whisper_full_default_params_by_ref.argtypes = [ctypes.c_int]
+            self.dll.whisper_full_default_params_by_ref.restype = ctypes.POINTER(WhisperFullParams)
             
-            # 포인터 기반 방식도 정의
-            self.dll.whisper_full_default_params.argtypes = []
-            self.dll.whisper_full_default_params.restype = ctypes.c_void_p
+            self.dll.whisper_free_params.argtypes = [ctypes.POINTER(WhisperFullParams)]
+            self.dll.whisper_free_params.restype = None
             
-            # 전체 처리 파라미터 및 실행 함수
-            self.dll.whisper_full.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.POINTER(ctypes.c_float), ctypes.c_int]
+            # 전체 처리 파라미터 및 실행 함수 (오디오는 float32 배열의 주소를 정수로 전달)
+            self.dll.whisper_full.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int]
             self.dll.whisper_full.restype = ctypes.c_int
             
+            # 오디오를 n_processors개로 나누어 동시에 처리 (결과는 기본 상태에 시간순으로 합쳐짐)
+            self.dll.whisper_full_parallel.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int, ctypes.c_int]
+            self.dll.whisper_full_parallel.restype = ctypes.c_int
+            
             # 세그먼트 관련 함수
             self.dll.whisper_full_n_segments.argtypes = [ctypes.c_void_p]
             self.dll.whisper_full_n_segments.restype = ctypes.c_int
@@ -474,6 +1209,43 @@ class WhisperDLL:
             self.dll.whisper_full_get_segment_t1.argtypes = [ctypes.c_void_p, ctypes.c_int]
             self.dll.whisper_full_get_segment_t1.restype = ctypes.c_int64
             
+            # 상태(whisper_state) 기반 함수 - 하나의 모델로 여러 작업을 동시에 처리
+            self.dll.whisper_init_state.argtypes = [ctypes.c_void_p]
+            self.dll.whisper_init_state.restype = ctypes.c_void_p
+            
+            self.dll.whisper_free_state.argtypes = [ctypes.c_void_p]
+            self.dll.whisper_free_state.restype = None
+            
+            self.dll.whisper_full_with_state.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int]
+            self.dll.whisper_full_with_state.restype = ctypes.c_int
+            
+            self.dll.whisper_full_n_segments_from_state.argtypes = [ctypes.c_void_p]
+            self.dll.whisper_full_n_segments_from_state.restype = ctypes.c_int
+            
+            self.dll.whisper_full_get_segment_text_from_state.argtypes = [ctypes.c_void_p, ctypes.c_int]
+            self.dll.whisper_full_get_segment_text_from_state.restype = ctypes.c_char_p
+            
+            self.dll.whisper_full_get_segment_t0_from_state.argtypes = [ctypes.c_void_p, ctypes.c_int]
+            self.dll.whisper_full_get_segment_t0_from_state.restype = ctypes.c_int64
+            
+            self.dll.whisper_full_get_segment_t1_from_state.argtypes = [ctypes.c_void_p, ctypes.c_int]
+            self.dll.whisper_full_get_segment_t1_from_state.restype = ctypes.c_int64
+            
             return True
         except Exception as e:
-            raise Exception(f"Whisper DLL 함수 초기화 실패: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Whisper DLL 함수 초기화 실패: {str(e)}")
+    
+    def _cache_functions(self):
+        """변환 실행과 결과 조회에 자주 쓰는 DLL 함수를 인스턴스에 캐시합니다. (호출마다 속성 탐색 생략)"""
+        self._f_full = self.dll.whisper_full
+        self._f_full_state = self.dll.whisper_full_with_state
+        self._f_full_parallel = self.dll.whisper_full_parallel
+        self._f_n_seg = self.dll.whisper_full_n_segments
+        self._f_text = self.dll.whisper_full_get_segment_text
+        self._f_t0 = self.dll.whisper_full_get_segment_t0
+        self._f_t1 = self.dll.whisper_full_get_segment_t1
+        
+        self._f_n_seg_state = self.dll.whisper_full_n_segments_from_state
+        self._f_text_state = self.dll.whisper_full_get_segment_text_from_state
+        self._f_t0_state = self.dll.whisper_full_get_segment_t0_from_state
+        self._f_t1_state = self.dll.whisper_full_get_segment_t1_from_state
\ No newline at end of file
@@ -1,6 +1,25 @@
 # whisper_gui/ui/__init__.py
 """UI modules for Whisper GUI."""
 
-from .main_window import WhisperGUI
-from .device_selection_dialog import DeviceSelectionDialog
-from .model_selection_dialog import ModelSelectionDialog
\ No newline at end of file
+import importlib
+
+__all__ = ["WhisperGUI", "DeviceSelectionDialog", "ModelSelectionDialog"]
+
+# 이름별 정의 모듈 (처음 접근할 때 가져와 패키지 임포트 비용을 줄임)
+_LAZY_IMPORTS = {
+    "WhisperGUI": ".main_window",
+    "DeviceSelectionDialog": ".device_selection_dialog",
+    "ModelSelectionDialog": ".model_selection_dialog",
+}
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # 이후 접근은 일반 속성 조회로 처리
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
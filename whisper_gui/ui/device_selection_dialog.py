@@ -1,24 +1,27 @@
 """
-장치 선택 다이얼로그 - GPU 또는 CPU 모드 선택
+장치 선택 다이얼로그 - GPU 백엔드(Vulkan) 또는 CPU 모드 선택
 """
 
-import os
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QRadioButton, QButtonGroup,
-                             QGroupBox, QMessageBox)
+                             QGroupBox, QCheckBox)
 from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QPixmap, QFont
+
+from ..core.utils import APP_ROOT, list_dir_cached
+from ..core.whisper_dll import GGML_CORE_DLLS, GPU_BACKENDS, available_backends, missing_system_dlls
+from .fonts import bold_font
+from .styles import set_state
 
 class DeviceSelectionDialog(QDialog):
-    """사용자가 GPU 또는 CPU 모드를 선택할 수 있는 다이얼로그"""
+    """사용자가 GPU 백엔드 또는 CPU 모드를 선택할 수 있는 다이얼로그"""
     
     # 장치 선택 완료 시 신호 전송
-    device_selected = pyqtSignal(bool)  # True: GPU, False: CPU
+    device_selected = pyqtSignal(str)  # 백엔드 이름 ("vulkan", "cpu")
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Whisper - 장치 선택")
-        self.setFixedSize(500, 300)
+        self.setFixedSize(500, 390)
         self.setModal(True)
         
         # 필요한 DLL 파일 확인
@@ -29,18 +32,20 @@ class DeviceSelectionDialog(QDialog):
         
     def check_required_dlls(self):
         """필요한 DLL 파일의 존재 여부 확인"""
-        self.current_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.current_dir = APP_ROOT
+        
+        # 디렉토리 목록을 한 번만 읽어 기본 DLL과 백엔드 DLL을 모두 확인
+        present = list_dir_cached(self.current_dir)
         
-        # Vulkan DLL 확인
-        self.vulkan_available = os.path.exists(os.path.join(self.current_dir, "ggml-vulkan.dll"))
+        # 백엔드 DLL이 있는 GPU 백엔드 확인
+        self.available_backends = available_backends(self.current_dir, present)
         
         # 기본 DLL 확인
-        self.required_dlls = ["whisper.dll", "ggml.dll", "ggml-base.dll", "ggml-cpu.dll"]
-        self.missing_dlls = []
+        self.required_dlls = ["whisper.dll", *GGML_CORE_DLLS]
+        self.missing_dlls = [dll for dll in self.required_dlls if dll.lower() not in present]
         
-        for dll in self.required_dlls:
-            if not os.path.exists(os.path.join(self.current_dir, dll)):
-                self.missing_dlls.append(dll)
+        # GGML DLL이 의존하는 시스템 DLL 확인 (Vulkan 런타임, Visual C++ 재배포 패키지)
+        self.missing_dlls += missing_system_dlls()
     
     def init_ui(self):
         """UI 구성"""
@@ -48,12 +53,8 @@ class DeviceSelectionDialog(QDialog):
         layout.setSpacing(15)
         
         # 타이틀 레이블
-        title_font = QFont()
-        title_font.setPointSize(14)
-        title_font.setBold(True)
-        
         title_label = QLabel("Whisper 음성 인식 장치 선택")
-        title_label.setFont(title_font)
+        title_label.setFont(bold_font(14))
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(title_label)
         
@@ -70,21 +71,26 @@ class DeviceSelectionDialog(QDialog):
         # 라디오 버튼 그룹
         self.btn_group = QButtonGroup()
         
-        # GPU 선택 버튼
-        self.gpu_radio = QRadioButton("GPU 가속 (Vulkan)")
-        self.gpu_radio.setEnabled(self.vulkan_available)
-        if self.vulkan_available:
-            self.gpu_radio.setChecked(True)
-            self.gpu_radio.setToolTip("Vulkan을 사용하여 GPU에서 처리합니다 (권장)")
-        else:
-            self.gpu_radio.setToolTip("ggml-vulkan.dll이 없어 GPU 가속을 사용할 수 없습니다")
-        self.btn_group.addButton(self.gpu_radio)
-        device_layout.addWidget(self.gpu_radio)
+        # GPU 백엔드 선택 버튼 (DLL이 있는 백엔드만 활성화, 첫 번째 사용 가능한 백엔드를 기본 선택)
+        # 시스템에 따라 더 빠른 백엔드가 다르므로 사용자가 직접 고를 수 있게 함
+        self.backend_radios = {}
+        for backend, (dll_name, name) in GPU_BACKENDS.items():
+            radio = QRadioButton(f"GPU 가속 ({name})")
+            available = backend in self.available_backends
+            radio.setEnabled(available)
+            if available:
+                radio.setChecked(backend == self.available_backends[0])
+                radio.setToolTip(f"{name}을(를) 사용하여 GPU에서 처리합니다")
+            else:
+                radio.setToolTip(f"{dll_name}이 없어 사용할 수 없습니다")
+            self.btn_group.addButton(radio)
+            device_layout.addWidget(radio)
+            self.backend_radios[backend] = radio
         
         # CPU 선택 버튼
         self.cpu_radio = QRadioButton("CPU 모드")
         self.cpu_radio.setToolTip("CPU를 사용하여 처리합니다 (느릴 수 있음)")
-        if not self.vulkan_available:
+        if not self.available_backends:
             self.cpu_radio.setChecked(True)
         self.btn_group.addButton(self.cpu_radio)
         device_layout.addWidget(self.cpu_radio)
@@ -96,47 +102,46 @@ class DeviceSelectionDialog(QDialog):
         self.status_label = QLabel()
         if self.missing_dlls:
             self.status_label.setText(f"경고: 일부 필수 DLL 파일이 없습니다: {', '.join(self.missing_dlls)}")
-            self.status_label.setStyleSheet("color: red;")
-        elif not self.vulkan_available:
+            set_state(self.status_label, "error")
+        elif not self.available_backends:
             self.status_label.setText("GPU 가속을 사용할 수 없습니다. CPU 모드로 실행됩니다.")
-            self.status_label.setStyleSheet("color: orange;")
+            set_state(self.status_label, "warn")
         else:
-            self.status_label.setText("모든 필수 DLL 파일이 로드되었습니다. GPU 및 CPU 모드를 사용할 수 있습니다.")
-            self.status_label.setStyleSheet("color: green;")
+            self.status_label.setText("모든 필수 DLL 파일이 확인되었습니다. GPU 및 CPU 모드를 사용할 수 있습니다.")
+            set_state(self.status_label, "ok")
         layout.addWidget(self.status_label)
         
+        # 필수 DLL이 없으면 확인 체크 후에만 다음 단계로 진행 (모달 경고창 대신 인라인 확인)
+        self.continue_check = QCheckBox("필수 파일 없이 계속 진행")
+        self.continue_check.setVisible(bool(self.missing_dlls))
+        layout.addWidget(self.continue_check)
+        
         # 버튼
         btn_layout = QHBoxLayout()
         
         exit_btn = QPushButton("종료")
         exit_btn.clicked.connect(self.reject)
         
-        next_btn = QPushButton("다음")
-        next_btn.clicked.connect(self.on_next_clicked)
-        next_btn.setDefault(True)
+        self.next_btn = QPushButton("다음")
+        self.next_btn.clicked.connect(self.on_next_clicked)
+        self.next_btn.setDefault(True)
+        self.next_btn.setEnabled(not self.missing_dlls)
+        self.continue_check.toggled.connect(self.next_btn.setEnabled)
         
         btn_layout.addWidget(exit_btn)
-        btn_layout.addWidget(next_btn)
+        btn_layout.addWidget(self.next_btn)
         
         layout.addLayout(btn_layout)
         self.setLayout(layout)
     
     def on_next_clicked(self):
         """다음 버튼 클릭 처리"""
-        # 필수 DLL이 없는 경우 경고
-        if self.missing_dlls:
-            reply = QMessageBox.warning(
-                self, 
-                "필수 파일 없음", 
-                f"일부 필수 파일이 없습니다: {', '.join(self.missing_dlls)}\n계속 진행하시겠습니까?",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                QMessageBox.StandardButton.No
-            )
-            
-            if reply != QMessageBox.StandardButton.Yes:
-                return
-        
-        # GPU 또는 CPU 선택 값 전달
-        use_gpu = self.gpu_radio.isChecked() and self.vulkan_available
-        self.device_selected.emit(use_gpu)
+        # 필수 DLL이 없는 경우 계속 진행 확인이 필요
+        if self.missing_dlls and not self.continue_check.isChecked():
+            return
+        
+        # 선택한 백엔드 이름 전달 (GPU 백엔드가 선택되지 않았으면 CPU)
+        backend = next((name for name, radio in self.backend_radios.items()
+                        if radio.isChecked() and name in self.available_backends), "cpu")
+        self.device_selected.emit(backend)
         self.accept()
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""
+UI 공용 글꼴 - 여러 창과 다이얼로그가 같은 QFont 객체를 공유합니다.
+"""
+
+from functools import lru_cache
+
+from PyQt6.QtGui import QFont
+
+@lru_cache(maxsize=None)
+def bold_font(size):
+    """
+    지정한 크기의 굵은 기본 글꼴을 반환합니다.
+    
+    QFont는 QApplication 생성 후에 만들어야 하므로 처음 요청할 때 만들고, 이후에는 같은 객체를 재사용합니다.
+    반환된 글꼴은 공유되므로 수정하지 말고 setFont에만 사용하세요.
+    
+    Args:
+        size (int): 글꼴 크기 (pt)
+        
+    Returns:
+        QFont: 굵은 글꼴
+    """
+    return QFont("", size, QFont.Weight.Bold)
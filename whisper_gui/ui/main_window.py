@@ -3,24 +3,48 @@
 """
 
 import os
-import sys
+import logging
 from PyQt6.QtWidgets import (QMainWindow, QPushButton, QVBoxLayout, 
-                             QHBoxLayout, QWidget, QLabel, QComboBox, QTextEdit, 
-                             QFileDialog, QProgressBar, QMessageBox, QApplication,
-                             QTabWidget, QFrame, QSplitter)
-from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QFont, QIcon
+                             QHBoxLayout, QWidget, QLabel, QComboBox, QPlainTextEdit, 
+                             QFileDialog, QProgressBar, QMessageBox,
+                             QTabWidget, QFrame)
+from PyQt6.QtCore import Qt, QTimer, QThreadPool, QFileSystemWatcher
+from PyQt6.QtGui import QStandardItem, QStandardItemModel
 
-from ..core.whisper_dll import WhisperDLL
-from ..core.recording_thread import RecordingThread
-from ..core.transcription_thread import TranscriptionThread
-from ..core.utils import find_dll_file, check_required_dlls
+from ..core.utils import APP_ROOT
 
-from .device_selection_dialog import DeviceSelectionDialog
-from .model_selection_dialog import ModelSelectionDialog
+from .fonts import bold_font
+from .styles import set_state
+
+# whisper_dll(numpy, numba 커널 포함), 녹음·인식 스레드와 다이얼로그 모듈은 로드가 느리므로
+# 메인 창을 먼저 표시한 뒤 처음 사용할 때 가져옴 (모두 UI 스레드에서 임포트)
+
+log = logging.getLogger(__name__)
+
+# 인식 언어 목록 (표시 이름, whisper 언어 코드)
+LANGUAGES = (
+    ("한국어", "ko"),
+    ("영어", "en"),
+    ("일본어", "ja"),
+    ("중국어", "zh"),
+    ("독일어", "de"),
+    ("프랑스어", "fr"),
+    ("스페인어", "es"),
+    ("이탈리아어", "it"),
+    ("러시아어", "ru"),
+)
 
 class WhisperGUI(QMainWindow):
     """Whisper 음성 인식 GUI 메인 클래스"""
+    
+    # 파일 대화상자 필터
+    AUDIO_FILTER = "오디오 파일 (*.wav *.mp3 *.ogg);;모든 파일 (*.*)"
+    RESULT_FILTER = "텍스트 파일 (*.txt);;모든 파일 (*.*)"
+    
+    # 결과 창에 유지하는 최대 줄(세그먼트) 수 - 넘으면 앞쪽 줄부터 버려 메모리와 레이아웃 비용을 제한
+    # (세그먼트당 약 5초 기준 10시간 이상 분량)
+    MAX_RESULT_BLOCKS = 10000
+    
     def __init__(self):
         super().__init__()
         
@@ -30,29 +54,49 @@ class WhisperGUI(QMainWindow):
         
         # 모델 파일 경로 저장 변수
         self.model_file_path = None
+        self._model_basename = ""  # 모델 파일 이름 (상태 표시용, 모델을 선택할 때 한 번만 계산)
         
         # Whisper DLL 인스턴스 관련 변수
         self.whisper = None
-        self.vulkan_enabled = True  # 기본값: Vulkan 사용
+        self._dll_path = None  # 처음 찾은 whisper DLL 경로 (백엔드 변경으로 인스턴스를 다시 만들 때 재사용)
+        self.backend = "vulkan"  # 기본값: Vulkan 사용 ("vulkan", "cpu")
         self.model_loaded = False
         
         # 스레드 초기화
         self.recording_thread = None
-        self.transcription_thread = None
+        
+        # 음성 인식 작업용 스레드 풀 (작업 스레드를 재사용하며,
+        # whisper 컨텍스트는 동시 접근이 안전하지 않으므로 한 번에 하나씩 실행)
+        self.transcription_pool = QThreadPool(self)
+        self.transcription_pool.setMaxThreadCount(1)
+        self.transcription_pool.setExpiryTimeout(-1)
+        self.transcription_task = None  # 마지막으로 시작한 인식 작업 (종료 시 취소용)
+        self._ctx_in_use = False  # 인식 작업이 whisper 컨텍스트를 사용 중인지 여부
+        self._pending_unload = None  # 사용 중이라 해제를 미룬 WhisperDLL 인스턴스 (작업이 끝나면 해제)
+        
+        # 오디오 열기·결과 저장에 함께 쓰는 파일 대화상자 (처음 사용할 때 생성)
+        self._file_dialog = None
+        self._file_dialog_callback = None  # 파일을 선택하면 호출할 함수
+        
+        # 실시간 세그먼트 표시 묶음 처리 (짧은 간격으로 도착한 세그먼트를 한 번에 추가)
+        self._pending_segments = []
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setSingleShot(True)
+        self._progress_timer.setInterval(80)
+        self._progress_timer.timeout.connect(self.flush_transcription_progress)
         
         # 실행 파일이 있는 디렉토리 경로
-        self.current_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.current_dir = APP_ROOT
         
-        # 모델 디렉토리 생성 및 확인
+        # 모델 디렉토리 (모델을 다운로드할 때 다운로더가 생성)
         self.models_dir = os.path.join(self.current_dir, "models")
-        if not os.path.exists(self.models_dir):
-            try:
-                os.makedirs(self.models_dir)
-                print(f"모델 디렉토리 생성: {self.models_dir}")
-            except Exception as e:
-                print(f"모델 디렉토리 생성 실패: {str(e)}")
-        else:
-            print(f"모델 디렉토리 확인: {self.models_dir}")
+        
+        # 모델 선택 다이얼로그가 검사한 모델 목록 (디렉토리가 바뀌지 않았으면 다음에 열 때 재사용)
+        self._cached_models = None
+        self._models_generation = 0  # 모델 디렉토리가 바뀔 때마다 증가
+        self._fs_watcher = QFileSystemWatcher(self)
+        self._fs_watcher.directoryChanged.connect(self.on_models_dir_changed)
+        self._watch_models_dir()
         
         # UI 초기화
         self.init_ui()
@@ -77,9 +121,10 @@ class WhisperGUI(QMainWindow):
         # 모델 정보
         model_layout = QVBoxLayout()
         model_title = QLabel("모델:")
-        model_title.setFont(QFont("", 9, QFont.Weight.Bold))
+        info_font = bold_font(9)  # 정보 영역 제목 글꼴 (두 레이블이 공유)
+        model_title.setFont(info_font)
         self.model_path_label = QLabel("모델이 로드되지 않음")
-        self.model_path_label.setStyleSheet("color: red;")
+        set_state(self.model_path_label, "error")
         
         model_layout.addWidget(model_title)
         model_layout.addWidget(self.model_path_label)
@@ -88,7 +133,7 @@ class WhisperGUI(QMainWindow):
         # 가속 모드 정보
         accel_layout = QVBoxLayout()
         accel_title = QLabel("가속 모드:")
-        accel_title.setFont(QFont("", 9, QFont.Weight.Bold))
+        accel_title.setFont(info_font)
         self.accel_label = QLabel("설정되지 않음")
         
         accel_layout.addWidget(accel_title)
@@ -97,14 +142,15 @@ class WhisperGUI(QMainWindow):
         
         # 버튼
         btn_layout = QVBoxLayout()
-        change_device_btn = QPushButton("장치 변경")
-        change_device_btn.clicked.connect(self.show_device_selection)
+        # 인식 작업(모델 로드 포함) 중에는 비활성화
+        self.change_device_btn = QPushButton("장치 변경")
+        self.change_device_btn.clicked.connect(self.show_device_selection)
         
-        change_model_btn = QPushButton("모델 변경")
-        change_model_btn.clicked.connect(self.show_model_selection)
+        self.change_model_btn = QPushButton("모델 변경")
+        self.change_model_btn.clicked.connect(self.show_model_selection)
         
-        btn_layout.addWidget(change_device_btn)
-        btn_layout.addWidget(change_model_btn)
+        btn_layout.addWidget(self.change_device_btn)
+        btn_layout.addWidget(self.change_model_btn)
         info_layout.addLayout(btn_layout)
         
         main_layout.addWidget(info_frame)
@@ -121,21 +167,15 @@ class WhisperGUI(QMainWindow):
         mic_lang_label = QLabel("인식 언어:")
         self.mic_language_combo = QComboBox()
         
-        # 주요 언어 추가
-        languages = [
-            ("한국어", "ko"),
-            ("영어", "en"),
-            ("일본어", "ja"),
-            ("중국어", "zh"),
-            ("독일어", "de"),
-            ("프랑스어", "fr"),
-            ("스페인어", "es"),
-            ("이탈리아어", "it"),
-            ("러시아어", "ru")
-        ]
-        
-        for name, code in languages:
-            self.mic_language_combo.addItem(name, code)
+        # 주요 언어 추가 (언어 목록 모델을 한 번에 만들어 두 탭의 콤보 박스가 공유)
+        language_items = []
+        for name, code in LANGUAGES:
+            item = QStandardItem(name)
+            item.setData(code, Qt.ItemDataRole.UserRole)
+            language_items.append(item)
+        self.language_model = QStandardItemModel(self)
+        self.language_model.appendColumn(language_items)  # 행마다 삽입 신호를 보내지 않고 한 번에 추가
+        self.mic_language_combo.setModel(self.language_model)
         
         mic_lang_layout.addWidget(mic_lang_label)
         mic_lang_layout.addWidget(self.mic_language_combo)
@@ -143,6 +183,7 @@ class WhisperGUI(QMainWindow):
         
         # 녹음 버튼
         self.record_btn = QPushButton("녹음 시작")
+        self.record_btn.setCheckable(True)  # 눌린 상태 = 녹음 중 (버튼이 상태를 관리)
         self.record_btn.clicked.connect(self.toggle_recording)
         self.record_btn.setEnabled(False)  # 모델 로드 전에는 비활성화
         mic_layout.addWidget(self.record_btn)
@@ -165,9 +206,8 @@ class WhisperGUI(QMainWindow):
         file_lang_label = QLabel("인식 언어:")
         self.file_language_combo = QComboBox()
         
-        # 언어 목록 복제
-        for name, code in languages:
-            self.file_language_combo.addItem(name, code)
+        # 언어 목록 공유
+        self.file_language_combo.setModel(self.language_model)
         
         file_lang_layout.addWidget(file_lang_label)
         file_lang_layout.addWidget(self.file_language_combo)
@@ -202,10 +242,11 @@ class WhisperGUI(QMainWindow):
         result_layout = QVBoxLayout(result_frame)
         
         result_label = QLabel("인식 결과:")
-        result_label.setFont(QFont("", 10, QFont.Weight.Bold))
+        result_label.setFont(bold_font(10))
         result_layout.addWidget(result_label)
         
-        self.result_text = QTextEdit()
+        self.result_text = QPlainTextEdit()  # 서식 없는 텍스트 전용 (끝에 추가할 때 레이아웃 비용이 적음)
+        self.result_text.setMaximumBlockCount(self.MAX_RESULT_BLOCKS)
         self.result_text.setReadOnly(True)
         result_layout.addWidget(self.result_text)
         
@@ -233,33 +274,47 @@ class WhisperGUI(QMainWindow):
     
     def show_device_selection(self):
         """장치 선택 다이얼로그 표시"""
+        if self._ctx_in_use:  # 인식 중에는 DLL 인스턴스를 바꾸지 않음
+            self.statusBar().showMessage("음성 인식이 끝난 후 장치를 변경하세요.")
+            return
+        
+        from .device_selection_dialog import DeviceSelectionDialog
+        
         dialog = DeviceSelectionDialog(self)
+        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
         dialog.device_selected.connect(self.on_device_selected)
+        dialog.finished.connect(self.on_device_dialog_finished)
         
-        # 윈도우 중앙에 표시
+        # 윈도우 중앙에 표시 (중첩 이벤트 루프 없이 모달로 열고 결과는 finished 신호로 처리)
         dialog.move(self.frameGeometry().center() - dialog.rect().center())
-        
-        if dialog.exec() == 0:  # 취소 시 다음 단계로 넘어가지 않음
+        dialog.open()
+    
+    def on_device_dialog_finished(self, result):
+        """장치 선택 다이얼로그가 닫힌 후 처리"""
+        if result == 0:  # 취소 시 다음 단계로 넘어가지 않음
             if not self.model_file_path:  # 모델이 선택되지 않은 경우에만 메시지 표시
                 self.statusBar().showMessage("시작하려면 장치와 모델을 선택하세요.")
     
-    def on_device_selected(self, use_gpu):
+    def on_device_selected(self, backend):
         """장치 선택 결과 처리"""
-        # 기존 모델이 메모리에 로드되어 있는 경우 먼저 해제
-        if self.model_loaded and self.whisper:
-            self.statusBar().showMessage("가속 모드 변경으로 인해 기존 모델을 메모리에서 해제하는 중...")
-            self.unload_model()
+        # 백엔드가 바뀐 경우에만 기존 모델을 해제하고 DLL 인스턴스를 버림
+        # (같은 백엔드를 다시 선택하면 DLL을 다시 로드하지 않고 그대로 사용)
+        if self.whisper and self.whisper.backend != backend:
+            if self.model_loaded:
+                self.statusBar().showMessage("가속 모드 변경으로 인해 기존 모델을 메모리에서 해제하는 중...")
+                self.unload_model()
+            
+            # DLL 초기화는 실제 사용 직전으로 늦춤
+            self.whisper = None  # 기존 인스턴스 제거
+            self.model_loaded = False
             
-        # Vulkan 설정 저장
-        self.vulkan_enabled = use_gpu
+        # 백엔드 설정 저장
+        self.backend = backend
         
         # UI 업데이트
-        self.accel_label.setText("Vulkan GPU" if use_gpu else "CPU")
-        self.accel_label.setStyleSheet("color: green;")
-        
-        # DLL 초기화 위치를 현재 위치로 변경 (초기화 시점을 실제 사용 직전으로 늦춤)
-        self.whisper = None  # 기존 인스턴스 제거
-        self.model_loaded = False
+        from ..core.whisper_dll import backend_label
+        self.accel_label.setText(backend_label(backend))
+        set_state(self.accel_label, "ok")
         
         # 모델 로드 지시
         self.statusBar().showMessage("장치가 선택되었습니다. 이제 모델을 선택하세요.")
@@ -270,24 +325,54 @@ class WhisperGUI(QMainWindow):
     def show_model_selection(self):
         """모델 선택 다이얼로그 표시"""
         # 장치가 선택되지 않은 경우
-        if not hasattr(self, 'vulkan_enabled'):
+        if not hasattr(self, 'backend'):
             self.show_device_selection()
             return
-            
-        dialog = ModelSelectionDialog(self.vulkan_enabled, self)
+        
+        if self._ctx_in_use:  # 인식 중에는 모델을 바꾸지 않음
+            self.statusBar().showMessage("음성 인식이 끝난 후 모델을 변경하세요.")
+            return
+        
+        from .model_selection_dialog import ModelSelectionDialog
+        generation = self._models_generation
+        dialog = ModelSelectionDialog(self.backend, self, cached_models=self._cached_models)
         
         # 모델 디렉토리 설정 - 일관성 유지
         dialog.models_dir = self.models_dir
         
+        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
         dialog.model_selected.connect(self.on_model_selected)
+        dialog.finished.connect(lambda result: self.on_model_dialog_finished(dialog, generation, result))
         
-        # 윈도우 중앙에 표시
+        # 윈도우 중앙에 표시 (중첩 이벤트 루프 없이 모달로 열고 결과는 finished 신호로 처리)
         dialog.move(self.frameGeometry().center() - dialog.rect().center())
+        dialog.open()
+    
+    def on_model_dialog_finished(self, dialog, generation, result):
+        """모델 선택 다이얼로그가 닫힌 후 처리 (generation: 다이얼로그를 열 때의 모델 디렉토리 변경 횟수)"""
+        # 다이얼로그가 열려 있는 동안 디렉토리가 바뀌지 않았으면 검사 결과 보관
+        if generation == self._models_generation:
+            self._cached_models = dialog.cached_models
         
-        if dialog.exec() == 0:  # 취소 시
+        if result == 0:  # 취소 시
             if not self.model_file_path:  # 모델이 선택되지 않은 경우에만 메시지 표시
                 self.statusBar().showMessage("시작하려면 모델을 선택하세요.")
     
+    def _watch_models_dir(self):
+        """모델 디렉토리 감시 (아직 없으면 생성되는 것을 알 수 있도록 상위 디렉토리를 감시)"""
+        target = self.models_dir if os.path.isdir(self.models_dir) else os.path.dirname(self.models_dir)
+        watched = self._fs_watcher.directories()
+        if watched != [target]:
+            if watched:
+                self._fs_watcher.removePaths(watched)
+            self._fs_watcher.addPath(target)
+    
+    def on_models_dir_changed(self, path):
+        """모델 디렉토리 변경 시 보관한 모델 목록을 버림"""
+        self._cached_models = None
+        self._models_generation += 1
+        self._watch_models_dir()
+    
     def on_model_selected(self, model_path):
         """모델 선택 결과 처리"""
         # 기존 모델이 메모리에 로드되어 있는 경우 먼저 해제
@@ -297,10 +382,11 @@ class WhisperGUI(QMainWindow):
             
         # 모델 경로 저장
         self.model_file_path = model_path
+        self._model_basename = os.path.basename(model_path)
         
         # UI 업데이트
-        self.model_path_label.setText(os.path.basename(model_path))
-        self.model_path_label.setStyleSheet("color: green;")
+        self.model_path_label.setText(self._model_basename)
+        set_state(self.model_path_label, "ok")
         
         # 버튼 활성화
         self.record_btn.setEnabled(True)
@@ -312,13 +398,14 @@ class WhisperGUI(QMainWindow):
         # 모델은 아직 메모리에 로드하지 않음 (첫 사용 시 로드)
         self.model_loaded = False
     
-    def toggle_recording(self):
-        """녹음 시작/중지 전환"""
+    def toggle_recording(self, checked):
+        """녹음 시작/중지 전환 (checked: 클릭 후 녹음 버튼의 눌린 상태)"""
         if not self.model_file_path:
+            self.record_btn.setChecked(False)
             QMessageBox.warning(self, "오류", "먼저 Whisper 모델 파일을 선택하세요.")
             return
         
-        if self.recording_thread and self.recording_thread.is_recording:
+        if not checked:
             # 녹음 중지
             self.recording_thread.stop()
             self.record_btn.setText("녹음 시작")
@@ -330,21 +417,19 @@ class WhisperGUI(QMainWindow):
             self.mic_progress_bar.setValue(0)
             self.result_text.clear()
             
-            # 녹음 스레드 생성 및 시작
+            # 녹음 스레드 생성 및 시작 (pyaudio는 처음 녹음할 때 가져옴)
+            from ..core.recording_thread import RecordingThread
             self.recording_thread = RecordingThread()
-            self.recording_thread.update_progress.connect(self.update_mic_progress)
+            self.recording_thread.update_progress.connect(self.mic_progress_bar.setValue)
             self.recording_thread.finished.connect(self.on_recording_finished)
             self.recording_thread.start()
             
             # 상태 메시지 업데이트
             self.statusBar().showMessage("녹음 중... 중지 버튼을 클릭하여 종료하세요.")
     
-    def update_mic_progress(self, value):
-        """마이크 탭 진행 상황 업데이트"""
-        self.mic_progress_bar.setValue(value)
-    
     def on_recording_finished(self, audio_file):
         """녹음 완료 후 처리"""
+        self.record_btn.setChecked(False)  # 최대 녹음 시간이 지나 스스로 끝난 경우
         self.record_btn.setText("녹음 시작")
         self.file_btn.setEnabled(True)
         
@@ -358,36 +443,59 @@ class WhisperGUI(QMainWindow):
             QMessageBox.warning(self, "오류", "먼저 Whisper 모델 파일을 선택하세요.")
             return
         
-        file_dialog = QFileDialog()
-        audio_file, _ = file_dialog.getOpenFileName(
-            self, "오디오 파일 선택", "", "오디오 파일 (*.wav *.mp3 *.ogg);;모든 파일 (*.*)"
-        )
+        self.open_file_dialog("오디오 파일 선택", self.AUDIO_FILTER, self.on_audio_file_selected)
+    
+    def on_audio_file_selected(self, audio_file):
+        """선택한 오디오 파일 인식 시작"""
+        # UI 업데이트
+        file_name = os.path.basename(audio_file)
+        self.file_path_label.setText(file_name)
+        self.result_text.clear()
+        self.file_progress_bar.setValue(0)
         
-        if audio_file:
-            # UI 업데이트
-            self.file_path_label.setText(os.path.basename(audio_file))
-            self.result_text.clear()
-            self.file_progress_bar.setValue(0)
-            
-            # 파일 인식 시작
-            self.statusBar().showMessage(f"파일을 로드했습니다: {os.path.basename(audio_file)}. 인식을 시작합니다...")
-            self.transcribe_audio(audio_file, self.file_language_combo.currentData(), self.file_progress_bar)
+        # 파일 인식 시작
+        self.statusBar().showMessage(f"파일을 로드했습니다: {file_name}. 인식을 시작합니다...")
+        self.transcribe_audio(audio_file, self.file_language_combo.currentData(), self.file_progress_bar)
+    
+    def open_file_dialog(self, title, name_filter, callback, save=False):
+        """
+        공유 파일 대화상자를 모달리스로 열고, 파일을 선택하면 callback(경로)을 호출합니다.
+        대화상자는 한 번만 만들어 재사용하므로 마지막으로 연 디렉토리도 유지됩니다.
+        """
+        if self._file_dialog is None:
+            self._file_dialog = QFileDialog(self)
+            self._file_dialog.fileSelected.connect(self.on_file_dialog_selected)
+        
+        dialog = self._file_dialog
+        dialog.setWindowTitle(title)
+        if save:
+            dialog.setAcceptMode(QFileDialog.AcceptMode.AcceptSave)
+            dialog.setFileMode(QFileDialog.FileMode.AnyFile)
+        else:
+            dialog.setAcceptMode(QFileDialog.AcceptMode.AcceptOpen)
+            dialog.setFileMode(QFileDialog.FileMode.ExistingFile)
+        dialog.setNameFilter(name_filter)
+        
+        self._file_dialog_callback = callback
+        dialog.open()
+    
+    def on_file_dialog_selected(self, file_path):
+        """공유 파일 대화상자에서 파일을 선택한 경우 처리"""
+        callback, self._file_dialog_callback = self._file_dialog_callback, None
+        if callback and file_path:
+            callback(file_path)
     
     def initialize_whisper(self):
-        """Whisper DLL 인스턴스 초기화"""
-        if self.whisper is not None:
+        """Whisper DLL 인스턴스 초기화 (선택한 백엔드의 인스턴스가 이미 있으면 재사용)"""
+        if self.whisper is not None and self.whisper.backend == self.backend:
             return True
         
+        from ..core.whisper_dll import WhisperDLL
+        
         try:
-            # DLL 파일 찾기
-            possible_dll_names = ["whisper.dll", "whisper_cpp.dll", "whisper-cpp.dll", "whisperdll.dll"]
-            dll_path = find_dll_file(self.current_dir, possible_dll_names)
-            
-            if not dll_path:
-                raise Exception("Whisper DLL 파일을 찾을 수 없습니다.")
-            
-            # Whisper DLL 인스턴스 생성
-            self.whisper = WhisperDLL(dll_path=dll_path, vulkan_support=self.vulkan_enabled)
+            # Whisper DLL 인스턴스 생성 (DLL 파일은 처음 한 번만 WhisperDLL이 찾음)
+            self.whisper = WhisperDLL(dll_path=self._dll_path, backend=self.backend)
+            self._dll_path = self.whisper.dll_path
             return True
         
         except Exception as e:
@@ -400,6 +508,11 @@ class WhisperGUI(QMainWindow):
             QMessageBox.warning(self, "오류", "먼저 Whisper 모델 파일을 선택하세요.")
             return
         
+        # 이전 인식 작업이 컨텍스트를 사용하는 동안에는 새 작업을 시작하지 않음
+        if self._ctx_in_use:
+            self.statusBar().showMessage("이전 음성 인식이 진행 중입니다. 끝난 후 다시 시도하세요.")
+            return
+        
         # Whisper DLL 초기화 확인
         if not self.initialize_whisper():
             return
@@ -409,92 +522,171 @@ class WhisperGUI(QMainWindow):
         self.result_text.clear()
         self.result_text.setPlaceholderText("모델 로드 중...")
         
-        # 이 시점에서 모델을 실제로 로드 (필요한 경우)
+        # 모델이 로드되지 않았으면 인식 작업 스레드에서 먼저 로드 (UI 스레드를 막지 않음)
+        model_path = None
         if not self.model_loaded or not hasattr(self.whisper, 'ctx') or not self.whisper.ctx:
-            try:
-                # 기존 모델이 있으면 먼저 해제
-                if self.model_loaded:
-                    self.unload_model()
-                
-                progress_bar.setRange(0, 0)  # 불확정 진행 상황 모드
-                QApplication.processEvents()  # UI 업데이트
-                
-                # 모델 로드
-                self.statusBar().showMessage("모델을 메모리에 로드하는 중... 잠시만 기다려주세요.")
-                self.whisper.load_model(self.model_file_path)
-                self.model_loaded = True
-                
-                # 로드 성공 표시
-                self.model_path_label.setText(f"{os.path.basename(self.model_file_path)} ({self.whisper.acceleration_mode} 모드) - 로드됨")
-                progress_bar.setRange(0, 100)  # 범위 복원
-            except Exception as e:
-                progress_bar.setRange(0, 100)
-                progress_bar.setValue(0)
-                self.result_text.setPlaceholderText("")
-                QMessageBox.critical(self, "모델 로드 오류", str(e))
-                return
+            # 기존 모델이 있으면 먼저 해제
+            if self.model_loaded:
+                self.unload_model()
+            
+            model_path = self.model_file_path
+            progress_bar.setRange(0, 0)  # 불확정 진행 상황 모드
+            self.statusBar().showMessage("모델을 메모리에 로드하는 중... 잠시만 기다려주세요.")
+        else:
+            # 이제 로드된 모델로 인식 시작
+            self.result_text.setPlaceholderText("인식 중...")
+            self.statusBar().showMessage("음성을 텍스트로 변환하는 중...")
+        
+        # 파일 인식 시작
+        # CPU 전용 모드에서는 그리디 디코딩이 훨씬 빠르므로 빔 탐색은 GPU 가속 시에만 사용
+        beam_size = 1 if self.whisper.acceleration_mode == "CPU" else 5
+        from ..core.transcription_thread import TranscriptionRunnable
+        task = TranscriptionRunnable(self.whisper, audio_file, language, beam_size=beam_size, model_path=model_path)
+        task.signals.model_loaded.connect(lambda: self.on_model_loaded(task, progress_bar))
+        task.signals.load_error.connect(lambda error_msg: self.on_model_load_error(error_msg, progress_bar))
+        task.signals.finished.connect(self.on_transcription_finished)
+        task.signals.progress.connect(self.on_transcription_progress)  # 실시간 텍스트 업데이트
+        task.signals.progress_percent.connect(progress_bar.setValue)  # 진행률 업데이트 (Qt 슬롯에 직접 연결)
+        task.signals.error.connect(self.on_transcription_error)
+        self.transcription_task = task
+        self._ctx_in_use = True
+        self.change_device_btn.setEnabled(False)
+        self.change_model_btn.setEnabled(False)
+        self.transcription_pool.start(task)
+    
+    def on_model_loaded(self, task, progress_bar):
+        """작업 스레드에서 모델 로드가 끝난 후 처리"""
+        progress_bar.setRange(0, 100)  # 범위 복원
+        
+        # 로드 도중 모델이나 장치가 바뀐 경우 (녹음 완료 등으로 다이얼로그가 열린 채 인식이 시작된 경우)
+        # 로드된 모델은 현재 선택과 다르므로 사용하지 않고 인식이 끝난 후 해제
+        if task.whisper is not self.whisper or task.model_path != self.model_file_path:
+            self._pending_unload = task.whisper
+            self.model_loaded = False
+            self.result_text.setPlaceholderText("인식 중...")
+            self.statusBar().showMessage("이전에 선택한 모델로 음성을 텍스트로 변환하는 중...")
+            return
+        
+        self.model_loaded = self._pending_unload is None
+        
+        # 로드 성공 표시
+        self.model_path_label.setText(f"{self._model_basename} ({self.whisper.acceleration_mode} 모드) - 로드됨")
+        set_state(self.model_path_label, "ok")  # 이전 로드 실패 표시 해제
+        
+        # 실제로 사용 중인 가속 모드 표시 (선택한 GPU 백엔드를 ggml에서 사용할 수 없으면 CPU로 실행됨)
+        self.accel_label.setText(self.whisper.acceleration_mode)
+        set_state(self.accel_label, "warn" if self.backend != "cpu" and self.whisper.acceleration_mode == "CPU" else "ok")
         
         # 이제 로드된 모델로 인식 시작
         self.result_text.setPlaceholderText("인식 중...")
         self.statusBar().showMessage("음성을 텍스트로 변환하는 중...")
+    
+    def on_model_load_error(self, error_msg, progress_bar):
+        """작업 스레드에서 모델 로드가 실패한 경우 처리"""
+        self.release_ctx()
+        self.model_loaded = False
+        progress_bar.setRange(0, 100)  # 범위 복원
+        progress_bar.setValue(0)
         
-        # 파일 인식 시작
-        self.transcription_thread = TranscriptionThread(self.whisper, audio_file, language)
-        self.transcription_thread.finished.connect(self.on_transcription_finished)
-        self.transcription_thread.progress.connect(self.on_transcription_progress)  # 실시간 텍스트 업데이트
-        self.transcription_thread.progress_percent.connect(lambda value: progress_bar.setValue(value))  # 진행률 업데이트
-        self.transcription_thread.error.connect(self.on_transcription_error)
-        self.transcription_thread.start()
+        # 로드 실패 표시
+        self.model_path_label.setText(f"{self._model_basename} - 로드 실패")
+        set_state(self.model_path_label, "error")
+        self.result_text.setPlaceholderText("")
+        QMessageBox.critical(self, "모델 로드 오류", error_msg)
+        self.statusBar().showMessage("모델을 로드하지 못했습니다. 다른 모델을 선택하거나 다시 시도하세요.")
     
     def on_transcription_progress(self, text):
-        """인식 진행 상황 텍스트 업데이트 (실시간)"""
+        """인식 진행 상황 텍스트 업데이트 (실시간, 새 세그먼트를 모았다가 타이머가 끝나면 추가)"""
+        self._pending_segments.append(text)
+        if not self._progress_timer.isActive():
+            self._progress_timer.start()
+    
+    def flush_transcription_progress(self):
+        """모아 둔 새 세그먼트를 결과 텍스트 끝에 한 번에 추가"""
+        self._progress_timer.stop()
+        if not self._pending_segments:
+            return
+        
+        text = "\n".join(self._pending_segments)
+        self._pending_segments.clear()
         self.result_text.setPlaceholderText("")
-        self.result_text.setText(text)
         
-        # 스크롤을 텍스트 끝으로 이동
-        cursor = self.result_text.textCursor()
-        cursor.movePosition(cursor.MoveOperation.End)
-        self.result_text.setTextCursor(cursor)
+        # 새 세그먼트를 새 줄로 끝에 추가 (스크롤이 끝에 있으면 계속 따라감)
+        self.result_text.appendPlainText(text)
 
-    def on_transcription_finished(self, text):
-        """인식 완료 후 처리"""
+    def on_transcription_finished(self, text, append):
+        """인식 완료 후 처리 (append: text가 실시간으로 표시한 내용 뒤에 이어지는 나머지인지 여부)"""
+        self.release_ctx()
+        
         active_tab = self.tabs.currentIndex()
         if active_tab == 0:  # 마이크 탭
             self.mic_progress_bar.setValue(100)
         else:  # 파일 탭
             self.file_progress_bar.setValue(100)
             
+        self.flush_transcription_progress()  # 아직 표시하지 않은 세그먼트 반영
         self.result_text.setPlaceholderText("")
-        self.result_text.setText(text)
+        
+        # 실시간으로 표시한 내용에 이어지는 나머지만 추가 (문서 전체를 다시 만들지 않음)
+        if append:
+            if text:
+                self.result_text.appendPlainText(text)
+        else:
+            self.result_text.setPlainText(text)
         
         self.statusBar().showMessage("음성 인식이 완료되었습니다.")
         
     def on_transcription_error(self, error_msg):
         """인식 오류 처리"""
+        self.release_ctx()
+        
         active_tab = self.tabs.currentIndex()
-        if active_tab == 0:  # 마이크 탭
-            self.mic_progress_bar.setValue(0)
-        else:  # 파일 탭
-            self.file_progress_bar.setValue(0)
+        progress_bar = self.mic_progress_bar if active_tab == 0 else self.file_progress_bar  # 0: 마이크 탭
+        progress_bar.setRange(0, 100)  # 모델 로드 중 실패한 경우 범위 복원
+        progress_bar.setValue(0)
             
+        self.flush_transcription_progress()  # 오류 전까지 인식된 세그먼트 반영
         self.result_text.setPlaceholderText("")
         QMessageBox.critical(self, "인식 오류", error_msg)
         
         self.unload_model()
         self.statusBar().showMessage("오류가 발생했습니다. 다시 시도하세요.")
         
-    def unload_model(self):
-        """모델을 메모리에서 해제"""
+    def release_ctx(self, background=True):
+        """인식 작업이 끝나 컨텍스트 사용을 마침 (사용 중이라 미뤄 둔 모델 해제를 이때 수행)"""
+        self._ctx_in_use = False
+        self.change_device_btn.setEnabled(True)
+        self.change_model_btn.setEnabled(True)
+        pending, self._pending_unload = self._pending_unload, None
+        if pending is not None and pending.ctx:
+            log.info("미뤄 둔 모델 메모리 해제")
+            pending.free_model(background)
+    
+    def unload_model(self, background=True):
+        """
+        모델을 메모리에서 해제
+        
+        인식 작업이 컨텍스트를 사용 중이면 바로 해제하지 않고 작업이 끝날 때(release_ctx) 해제합니다.
+        background=False이면 해제가 끝날 때까지 기다립니다 (종료 시 데몬 스레드가 중간에 끝나지 않도록).
+        (사용 중인 컨텍스트를 해제하거나 같은 컨텍스트를 두 번 해제하면 GPU 백엔드에서 충돌하거나 장치 메모리가 남음)
+        """
+        if self._ctx_in_use:
+            if self.whisper is not None and self.whisper.ctx:
+                self._pending_unload = self.whisper
+            self.model_loaded = False
+            log.info("인식 작업이 끝난 후 모델 메모리를 해제합니다.")
+            return False
+        
         try:
             if self.whisper and hasattr(self.whisper, 'ctx') and self.whisper.ctx:
                 print("모델 메모리 해제 시작")
                 # 새 free_model 메서드 사용
-                result = self.whisper.free_model()
+                result = self.whisper.free_model(background)
                 self.model_loaded = False
                 
                 # UI 업데이트
                 if self.model_file_path:
-                    self.model_path_label.setText(f"{os.path.basename(self.model_file_path)} - 준비됨 (메모리 해제됨)")
+                    self.model_path_label.setText(f"{self._model_basename} - 준비됨 (메모리 해제됨)")
                     
                 print(f"모델 메모리 해제 완료: {result}")
                 return result
@@ -505,6 +697,7 @@ class WhisperGUI(QMainWindow):
         
     def clear_results(self):
         """결과 지우기"""
+        self._pending_segments.clear()
         self.result_text.clear()
         self.mic_progress_bar.setValue(0)
         self.file_progress_bar.setValue(0)
@@ -512,51 +705,76 @@ class WhisperGUI(QMainWindow):
     
     def copy_results(self):
         """결과 클립보드에 복사"""
-        text = self.result_text.toPlainText()
-        if text:
-            clipboard = QApplication.clipboard()
-            clipboard.setText(text)
-            self.statusBar().showMessage("텍스트가 클립보드에 복사되었습니다.")
-        else:
+        if self.result_text.document().isEmpty():
             self.statusBar().showMessage("복사할 텍스트가 없습니다.")
+            return
+        
+        # 문서 전체를 Python 문자열로 만들지 않고 위젯이 직접 클립보드로 복사 (원래 커서·선택 영역은 복원)
+        cursor = self.result_text.textCursor()
+        self.result_text.selectAll()
+        self.result_text.copy()
+        self.result_text.setTextCursor(cursor)
+        self.statusBar().showMessage("텍스트가 클립보드에 복사되었습니다.", 2000)
     
     def save_results(self):
         """결과 파일로 저장"""
-        text = self.result_text.toPlainText()
-        if not text:
+        if self.result_text.document().isEmpty():
             QMessageBox.warning(self, "저장 실패", "저장할 텍스트가 없습니다.")
             return
         
-        file_dialog = QFileDialog()
-        file_path, _ = file_dialog.getSaveFileName(
-            self, "결과 저장", "", "텍스트 파일 (*.txt);;모든 파일 (*.*)"
-        )
-        
-        if file_path:
-            try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(text)
-                self.statusBar().showMessage(f"결과가 {file_path}에 저장되었습니다.")
-            except Exception as e:
-                QMessageBox.critical(self, "저장 실패", f"파일 저장 중 오류 발생: {str(e)}")
+        self.open_file_dialog("결과 저장", self.RESULT_FILTER, self.on_save_path_selected, save=True)
+    
+    def on_save_path_selected(self, file_path):
+        """선택한 경로에 결과 저장 (대화상자가 열려 있는 동안 바뀐 내용도 반영)"""
+        try:
+            # 블록마다 바인딩을 호출하는 것보다 문서 전체를 한 번에 가져와 인코딩하는 편이 훨씬 빠름
+            # (결과는 MAX_RESULT_BLOCKS 줄로 제한됨). 텍스트 모드의 인코더·줄바꿈 변환 계층 없이 바이트로 한 번에 기록
+            text = self.result_text.toPlainText()
+            if os.linesep != "\n":  # 텍스트 모드와 같이 OS 기본 줄바꿈 사용
+                text = text.replace("\n", os.linesep)
+            data = text.encode('utf-8')
+            with open(file_path, 'wb') as f:
+                f.write(data)
+            self.statusBar().showMessage(f"결과가 {file_path}에 저장되었습니다.")
+        except Exception as e:
+            QMessageBox.critical(self, "저장 실패", f"파일 저장 중 오류 발생: {str(e)}")
     
     def closeEvent(self, event):
         """프로그램 종료 시 처리"""
         try:
-            # 녹음 중이면 중지
+            # 녹음 중이면 중지 (임시 파일에 기록을 마칠 때까지 대기)
             if self.recording_thread and self.recording_thread.is_recording:
                 self.recording_thread.stop()
+                self.recording_thread.wait(1000)
+            
+            # 진행 중인 인식 작업 취소 - 창이 닫힌 뒤 신호가 전달되거나 사용 중인 모델이 해제되지 않도록
+            # 신호 연결을 끊고 작업 스레드가 끝날 때까지 기다림 (whisper는 다음 30초 구간 전에 중단)
+            idle = True
+            if self.transcription_task is not None:
+                self.transcription_task.cancel()
+                signals = self.transcription_task.signals
+                for signal in (signals.model_loaded, signals.load_error, signals.finished,
+                               signals.progress, signals.progress_percent, signals.error):
+                    try:
+                        signal.disconnect()
+                    except TypeError:  # 연결된 슬롯이 없는 경우
+                        pass
+                idle = self.transcription_pool.waitForDone(3000)
             
             # 임시 파일 삭제
             if self.recording_thread and hasattr(self.recording_thread, 'temp_file') and self.recording_thread.temp_file:
                 try:
-                    if os.path.exists(self.recording_thread.temp_file):
-                        os.remove(self.recording_thread.temp_file)
-                except Exception as e:
-                    print(f"임시 파일 삭제 실패: {str(e)}")
+                    os.unlink(self.recording_thread.temp_file)
+                except FileNotFoundError:  # 이미 삭제된 경우
+                    pass
+                except OSError as e:
+                    log.warning("임시 파일 삭제 실패: %s", e)
             
-            # Whisper 리소스 해제
-            self.unload_model()
+            # Whisper 리소스 해제 (인식이 아직 끝나지 않았으면 사용 중인 컨텍스트를 해제하지 않음)
+            # 백그라운드 해제 스레드는 데몬이라 프로그램 종료 시 중간에 끝나므로 해제가 끝날 때까지 기다림
+            if idle:
+                self.release_ctx(background=False)  # 취소된 작업은 완료 신호를 보내지 않음
+                self.unload_model(background=False)
             
             print("프로그램 종료")
         except Exception as e:
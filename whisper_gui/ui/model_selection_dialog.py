@@ -5,11 +5,13 @@
 import os
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QListWidget, QListWidgetItem,
-                             QMessageBox, QFileDialog, QProgressBar, QFrame)
-from PyQt6.QtCore import Qt, pyqtSignal, QSize
-from PyQt6.QtGui import QFont, QIcon
+                             QMessageBox, QFileDialog, QFrame)
+from PyQt6.QtCore import Qt, pyqtSignal, QThreadPool
 
-from ..core.model_downloader import ModelDownloader
+from ..core.model_check_thread import ModelCheckRunnable
+from ..core.utils import APP_ROOT, invalidate_cache
+from ..core.whisper_dll import backend_label
+from .fonts import bold_font
 
 class ModelSelectionDialog(QDialog):
     """사용자가 Whisper 모델을 선택하거나 다운로드할 수 있는 다이얼로그"""
@@ -17,34 +19,36 @@ class ModelSelectionDialog(QDialog):
     # 모델 선택 완료 시 신호 전송
     model_selected = pyqtSignal(str)  # 선택된 모델 파일 경로
     
-    def __init__(self, vulkan_support=True, parent=None):
+    # 모델 파일 대화상자 필터
+    MODEL_FILTER = "모델 파일 (*.bin *.ggml);;모든 파일 (*.*)"
+    
+    def __init__(self, backend="vulkan", parent=None, cached_models=None):
         super().__init__(parent)
         self.setWindowTitle("Whisper - 모델 선택")
         self.setMinimumSize(600, 400)
         self.setModal(True)
         
-        self.vulkan_support = vulkan_support
+        self.backend = backend
+        self._model_items = {}  # 모델 파일 경로: (목록 아이템, 모델 이름, 언어 정보, 크기 MB)
+        self._model_check_task = None  # 마지막으로 시작한 모델 검사 작업
+        self._select_after_load = None  # 목록을 채운 뒤 선택할 모델 파일 경로
+        self._listed = None  # 작업 스레드에서 읽은 (디렉터리 존재 여부, 모델 목록)
+        self._model_ftypes = {}  # 모델 파일 경로: 헤더에서 읽은 가중치 형식
+        self.cached_models = None  # 검사를 마친 (디렉터리 존재 여부, 모델 목록, 가중치 형식) - 다음에 열 때 재사용
         
         # 모델 디렉토리
-        self.current_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.current_dir = APP_ROOT
         self.models_dir = os.path.join(self.current_dir, "models")
         
         # 부모 객체에서 모델 디렉토리 가져오기 (일관성 유지)
         if parent and hasattr(parent, 'models_dir'):
             self.models_dir = parent.models_dir
         
-        # 모델 디렉토리 생성 (없는 경우)
-        if not os.path.exists(self.models_dir):
-            try:
-                os.makedirs(self.models_dir)
-            except Exception as e:
-                print(f"모델 디렉토리 생성 실패: {str(e)}")
-        
         # UI 초기화
         self.init_ui()
         
-        # 모델 목록 로드
-        self.load_models()
+        # 모델 목록 로드 (이전 검사 결과가 있으면 재사용하고, 없으면 작업 스레드에서 읽으므로 다이얼로그는 바로 표시됨)
+        self.load_models(cached_models=cached_models)
         
     def init_ui(self):
         """UI 구성"""
@@ -52,17 +56,13 @@ class ModelSelectionDialog(QDialog):
         layout.setSpacing(15)
         
         # 타이틀 레이블
-        title_font = QFont()
-        title_font.setPointSize(14)
-        title_font.setBold(True)
-        
         title_label = QLabel("Whisper 음성 인식 모델 선택")
-        title_label.setFont(title_font)
+        title_label.setFont(bold_font(14))
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(title_label)
         
         # 가속 모드 표시
-        accel_label = QLabel(f"선택된 가속 모드: {'Vulkan GPU' if self.vulkan_support else 'CPU'}")
+        accel_label = QLabel(f"선택된 가속 모드: {backend_label(self.backend)}")
         accel_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(accel_label)
         
@@ -74,7 +74,7 @@ class ModelSelectionDialog(QDialog):
         model_layout = QVBoxLayout(model_frame)
         
         model_header = QLabel("설치된 모델 목록")
-        model_header.setFont(QFont("", 10, QFont.Weight.Bold))
+        model_header.setFont(bold_font(10))
         model_layout.addWidget(model_header)
         
         # 모델 목록
@@ -87,7 +87,7 @@ class ModelSelectionDialog(QDialog):
         btn_layout = QHBoxLayout()
         
         self.refresh_btn = QPushButton("새로고침")
-        self.refresh_btn.clicked.connect(self.load_models)
+        self.refresh_btn.clicked.connect(self.refresh_models)
         
         self.download_btn = QPushButton("모델 다운로드")
         self.download_btn.clicked.connect(self.show_model_downloader)
@@ -123,50 +123,126 @@ class ModelSelectionDialog(QDialog):
         layout.addLayout(bottom_btn_layout)
         self.setLayout(layout)
     
-    def load_models(self):
-        """설치된 모델 파일 목록 로드"""
+    def refresh_models(self):
+        """새로고침 버튼 처리 (캐시된 디렉터리 목록을 버리고 다시 읽음)"""
+        invalidate_cache()
+        self.load_models()
+    
+    def load_models(self, select_path=None, cached_models=None):
+        """
+        설치된 모델 파일 목록 로드
+        
+        디렉터리 읽기와 파일 헤더 검사는 작업 스레드에서 실행하고, 목록은 결과 신호를 받아 채웁니다.
+        select_path가 주어지면 목록을 채운 뒤 해당 모델을 선택합니다.
+        cached_models(이전 다이얼로그의 cached_models)가 주어지면 디스크를 다시 읽지 않고 그대로 표시합니다.
+        """
         self.model_list.clear()
+        self._model_items = {}
+        self._model_ftypes = {}
+        self._listed = None
+        self.cached_models = None
         self.selected_model_path = None
         self.next_btn.setEnabled(False)
+        self._select_after_load = select_path
+        
+        # 이전 검사 작업의 결과는 더 이상 받지 않음
+        if self._model_check_task is not None:
+            self._model_check_task.cancel()
+            self._model_check_task = None
+        
+        if cached_models is not None:
+            exists, models, ftypes = cached_models
+            self._model_ftypes = dict(ftypes)
+            self.cached_models = cached_models
+            self._show_models(exists, models)
+            return
         
-        # models 디렉토리 검사
-        if not os.path.exists(self.models_dir):
-            self.status_label.setText("모델 디렉토리가 없습니다. 모델을 다운로드하세요.")
+        self.status_label.setText("모델 목록을 불러오는 중...")
+        
+        # 모델 디렉토리 검사는 UI 스레드를 막지 않도록 전역 스레드 풀에서 실행
+        task = ModelCheckRunnable(self.models_dir)
+        task.signals.listed.connect(lambda exists, models: self._on_models_listed(task, exists, models))
+        task.signals.checked.connect(self._on_model_checked)
+        task.signals.finished.connect(lambda: self._on_model_check_finished(task))
+        task.signals.error.connect(self._on_model_check_error)
+        self._model_check_task = task
+        QThreadPool.globalInstance().start(task)
+    
+    def _on_models_listed(self, task, exists, models):
+        """작업 스레드에서 읽은 모델 파일 목록으로 리스트 채우기"""
+        if task is not self._model_check_task:  # 다시 로드하기 전에 시작한 작업의 결과
             return
         
-        # 모델 파일 목록 가져오기
-        model_files = []
-        for file in os.listdir(self.models_dir):
-            if file.endswith('.bin') or 'ggml' in file:
-                model_files.append(file)
+        self._listed = (exists, models)
+        self._show_models(exists, models)
+    
+    def _show_models(self, exists, models):
+        """모델 파일 목록으로 리스트 채우기 (이미 읽은 가중치 형식은 함께 표시)"""
+        if not exists:
+            self.status_label.setText("모델 디렉토리가 없습니다. 모델을 다운로드하세요.")
+            return
         
-        if not model_files:
+        if not models:
             self.status_label.setText("설치된 모델이 없습니다. 모델을 다운로드하세요.")
             return
         
-        # 모델 파일 목록에 추가
-        for file in sorted(model_files):
-            file_path = os.path.join(self.models_dir, file)
-            file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
-            
-            # 모델 정보 파싱 (ggml-small.bin -> small)
-            model_name = file.replace('ggml-', '').replace('.bin', '')
-            
-            # 언어 정보 및 크기 (tiny.en -> 영어 전용 tiny)
-            lang_info = "다국어"
-            if '.en' in model_name:
-                lang_info = "영어 전용"
-                model_name = model_name.replace('.en', '')
-            
-            # 아이템 생성
-            item = QListWidgetItem(f"{model_name} ({lang_info}, {file_size_mb:.1f} MB)")
-            item.setData(Qt.ItemDataRole.UserRole, file_path)
-            self.model_list.addItem(item)
+        # 모델 파일 목록에 추가 (이름순으로 정렬되어 있음)
+        # (모델 이름은 작업 스레드에서 파일 이름을 파싱한 값: ggml-tiny.en.bin -> 영어 전용 tiny)
+        # 모든 아이템을 추가할 때까지 다시 그리지 않음
+        self.model_list.setUpdatesEnabled(False)
+        try:
+            for file_path, model_name, english_only, size in models:
+                file_size_mb = size / (1024 * 1024)
+                lang_info = "영어 전용" if english_only else "다국어"
+                
+                # 아이템 생성 (가중치 형식은 작업 스레드에서 헤더를 읽은 뒤 추가)
+                ftype = self._model_ftypes.get(file_path)
+                details = f"{lang_info}, {ftype}" if ftype else lang_info
+                item = QListWidgetItem(f"{model_name} ({details}, {file_size_mb:.1f} MB)")
+                item.setData(Qt.ItemDataRole.UserRole, file_path)
+                self.model_list.addItem(item)
+                self._model_items[file_path] = (item, model_name, lang_info, file_size_mb)
+        finally:
+            self.model_list.setUpdatesEnabled(True)
+        
+        self.status_label.setText(f"{len(models)}개의 모델이 설치되어 있습니다.")
+        
+        # 다운로드 직후 등 선택할 모델이 지정된 경우
+        entry = self._model_items.get(self._select_after_load)
+        if entry is not None:
+            self.model_list.setCurrentItem(entry[0])
+            self.selected_model_path = self._select_after_load
+            self.status_label.setText(f"선택된 모델: {os.path.basename(self.selected_model_path)}")
+            self.next_btn.setEnabled(True)
+    
+    def _on_model_checked(self, model_path, ftype):
+        """헤더에서 읽은 가중치 형식(예: F16, Q5_1)을 목록 아이템에 표시"""
+        entry = self._model_items.get(model_path)
+        if entry is not None:
+            self._model_ftypes[model_path] = ftype
+        if entry is None or not ftype:  # 목록이 다시 로드되었거나 ggml 모델이 아닌 경우
+            return
+        
+        item, model_name, lang_info, file_size_mb = entry
+        item.setText(f"{model_name} ({lang_info}, {ftype}, {file_size_mb:.1f} MB)")
+    
+    def _on_model_check_finished(self, task):
+        """모든 모델 파일 검사가 끝나면 결과를 보관 (다음에 다이얼로그를 열 때 재사용)"""
+        if task is not self._model_check_task or self._listed is None:
+            return
         
-        self.status_label.setText(f"{len(model_files)}개의 모델이 설치되어 있습니다.")
+        exists, models = self._listed
+        self.cached_models = (exists, models, dict(self._model_ftypes))
+    
+    def _on_model_check_error(self, error_msg):
+        """모델 파일 검사 오류 처리 (형식 표시만 생략)"""
+        print(f"모델 파일 검사 실패: {error_msg}")
     
     def show_model_downloader(self):
         """모델 다운로드 다이얼로그 표시"""
+        # 다운로드 모듈(QtNetwork 포함)은 다운로드 창을 처음 열 때 가져옴
+        from ..core.model_downloader import ModelDownloader
+        
         # ModelDownloader에 현재 모델 디렉토리 전달
         downloader = ModelDownloader(self)
         # 모델 디렉토리 설정
@@ -174,19 +250,15 @@ class ModelSelectionDialog(QDialog):
         downloader.path_label.setText(self.models_dir)
         downloader.exec()  # 모달 대화상자로 실행
         
-        # 다운로드 후 모델 리스트 갱신
-        self.load_models()
+        # 다운로드 후 모델 리스트 갱신 (다운로드한 모델이 있으면 선택 유지)
+        self.load_models(select_path=self._select_after_load)
     
     def browse_model_file(self):
         """파일 선택 대화상자로 모델 파일 찾기"""
-        file_dialog = QFileDialog()
         # 기본 시작 디렉토리를 모델 폴더로 설정
         start_dir = self.models_dir if os.path.exists(self.models_dir) else ""
         
-        model_path, _ = file_dialog.getOpenFileName(
-            self, "Whisper 모델 파일 선택", start_dir, 
-            "모델 파일 (*.bin *.ggml);;모든 파일 (*.*)"
-        )
+        model_path, _ = QFileDialog.getOpenFileName(self, "Whisper 모델 파일 선택", start_dir, self.MODEL_FILTER)
         
         if model_path:
             # 파일 크기 검증 (최소 크기 검사)
@@ -229,17 +301,11 @@ class ModelSelectionDialog(QDialog):
         if not model_path or not os.path.exists(model_path):
             return
         
-        # 새로 다운로드된 모델을 현재 모델로 설정
-        self.selected_model_path = model_path
-        self.status_label.setText(f"선택된 모델: {os.path.basename(model_path)}")
-        self.next_btn.setEnabled(True)
-        
-        # 모델 목록 갱신
-        self.load_models()
-        
-        # 다운로드된 모델 선택
-        for i in range(self.model_list.count()):
-            item = self.model_list.item(i)
-            if item.data(Qt.ItemDataRole.UserRole) == model_path:
-                self.model_list.setCurrentItem(item)
-                break
\ No newline at end of file
+        # 모델 목록을 갱신하고 새로 다운로드된 모델을 현재 모델로 선택
+        self.load_models(select_path=model_path)
+    
+    def done(self, result):
+        """다이얼로그를 닫을 때 진행 중인 모델 검사 작업 취소"""
+        if self._model_check_task is not None:
+            self._model_check_task.cancel()
+        super().done(result)
@@ -0,0 +1,29 @@
+"""
+UI 공용 스타일 - 상태 표시 레이블의 색상을 애플리케이션 스타일시트 하나로 정의합니다.
+"""
+
+# 상태별 레이블 색상 (QApplication에 한 번만 설정하고, 레이블은 "state" 속성만 바꿈)
+STATE_STYLE_SHEET = (
+    'QLabel[state="ok"] { color: green; }'
+    'QLabel[state="warn"] { color: orange; }'
+    'QLabel[state="error"] { color: red; }'
+)
+
+def set_state(widget, state):
+    """
+    위젯의 상태 속성을 바꾸고 스타일을 다시 적용합니다.
+    
+    위젯마다 setStyleSheet를 호출하면 호출할 때마다 CSS를 다시 파싱하므로,
+    STATE_STYLE_SHEET의 선택자에 맞는 속성 값만 바꾸고 다시 polish합니다.
+    
+    Args:
+        widget (QWidget): 대상 위젯 (보통 QLabel)
+        state (str): "ok", "warn", "error" 중 하나
+    """
+    if widget.property("state") == state:
+        return
+    
+    widget.setProperty("state", state)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)